@@ -1,11 +1,75 @@
 import csv
+import math
+import queue
 import random
-import re
+import sys
+import threading
 import time
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
-from playwright.sync_api import Page, Playwright, sync_playwright
+from playwright.sync_api import (
+    Browser,
+    BrowserContext,
+    Page,
+    Playwright,
+    sync_playwright,
+)
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.archive import PageArchive  # noqa: E402
+from common.browser_daemon import open_browser  # noqa: E402
+from common.contacts import ContactStage, company_key, open_seen_store  # noqa: E402
+from common.governor import PageRecycler, ResourceGovernor  # noqa: E402
+from common.metrics import Metrics  # noqa: E402
+from common.network import (  # noqa: E402
+    INTERACTIVE_LAUNCH_OPTIONS,
+    LEAN_LAUNCH_OPTIONS,
+    RequestBlocker,
+)
+from common.pacing import AdaptiveRateLimiter  # noqa: E402
+from common.retry import (  # noqa: E402
+    MissingElementError,
+    RetryQueue,
+    load_dead_letters,
+)
+from common.sharding import (  # noqa: E402
+    merge_csv_files,
+    run_processes,
+    shard_of,
+    shard_path,
+)
+from company_cache import CompanyCache  # noqa: E402
+from posting_parser import (  # noqa: E402
+    extract_email,
+    is_security_page,
+    parse_posting,
+    read_listings,
+    read_posting,
+)
+
+# Recruit URL CSV read by email collection unless another one is given
+DEFAULT_URLS_CSV = "recruit_urls_20250207_112942.csv"
+
+# What add_result did with a result: written, dropped as a duplicate, or
+# turned away because max_emails had already been reached
+RESULT_ADDED = "added"
+RESULT_DUPLICATE = "duplicate"
+RESULT_REJECTED = "rejected"
+
+# Columns of the email results CSV
+RESULT_COLUMNS = [
+    "Company Name",
+    "Email",
+    "Position Name",
+    "Industry",
+    "Employees",
+    "Established Year",
+    "Company Size",
+    "Homepage",
+]
 
 
 class JobScraper:
@@ -18,12 +82,32 @@ class JobScraper:
         )
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.recruit_urls: Dict[str, str] = {}
-        self.scrape_results: List[Tuple[str, str, str, str, str, str, str, str]] = (
-            []
-        )  # [(company, email, position_name, industry, len(employee), since(year), firm_size, homepage)]
+        # Results are written to the results CSV as they are found; only the
+        # hashed keys of their contacts stay in memory for deduplication
+        self.result_count = 0
+        self._results_file = None
+        self._results_writer = None
         self.max_emails = 200  # Default value
         self.max_companies = 1000  # Default value
         self.max_companies_to_process = 1000  # Default value for email collection
+        self.browser_daemon_url = None  # Falls back to $BROWSER_DAEMON_URL
+        self.set_headless(False)  # Sets launch_options and request_blocker
+        self.concurrency = 1  # Number of browsers collecting emails at once
+        self.search_concurrency = 1  # Number of browsers loading search pages
+        self.session_file = "jobkorea_session.json"  # Saved cookies and storage
+        self.logged_in_selector = "a:has-text('로그아웃')"
+        self.interactive_login = True  # Ask for a manual login if needed
+        self.rate_limiter = AdaptiveRateLimiter(rate=0.5, max_rate=3.0)
+        self.challenge_poll_interval = 5.0  # Seconds between security check polls
+        self.reload_on_challenge = False  # Reload while waiting, for unattended runs
+        self.metrics = Metrics("jobkorea")  # Events file set with set_metrics_file
+        self.retry_queue = RetryQueue(f"jobkorea_failed_{self.timestamp}.jsonl")
+        self.company_cache = CompanyCache("jobkorea_cache.sqlite3", ttl_days=30)
+        self.governor = ResourceGovernor()  # Replaces pages that ran too long
+        self.page_archive: Optional[PageArchive] = None  # Records posting pages
+        self._results_lock = threading.Lock()
+        self._company_keys = set()  # Companies already in recruit_urls
+        self.contact_stage = ContactStage(company=0, email=1, url=7)
 
     def set_max_emails(self, count: int) -> None:
         """Set the maximum number of emails to collect"""
@@ -37,316 +121,957 @@ class JobScraper:
         """Set the maximum number of companies to process when collecting emails"""
         self.max_companies_to_process = count
 
+    def set_concurrency(self, count: int) -> None:
+        """Set the number of browsers collecting emails in parallel.
+
+        Each one is a separate Chromium process with its own Playwright
+        driver (and its own window when headed), so memory grows about
+        linearly with count.
+        """
+        self.concurrency = max(1, count)
+
+    def set_search_concurrency(self, count: int) -> None:
+        """Set how many browsers load search result pages at once.
+
+        Like set_concurrency, each is a separate Chromium process.
+        """
+        self.search_concurrency = max(1, count)
+
+    def set_cache_ttl(self, days: float) -> None:
+        """Set how many days a visited posting is skipped in later runs"""
+        self.company_cache.ttl = days * 24 * 60 * 60
+
+    def set_headless(self, headless: bool) -> None:
+        """Set whether the browser runs without a window.
+
+        A visible browser is there for a manual login and security checks,
+        so it renders pages normally and only ad and tracker requests are
+        blocked. A headless one skips images, fonts and stylesheets too.
+        """
+        if headless:
+            self.launch_options = dict(LEAN_LAUNCH_OPTIONS)
+            self.request_blocker = RequestBlocker()
+        else:
+            self.launch_options = dict(INTERACTIVE_LAUNCH_OPTIONS)
+            self.request_blocker = RequestBlocker(blocked_types=())
+
+    def set_recycling(
+        self, max_navigations: int, max_rss_mb: Optional[float] = None
+    ) -> None:
+        """Replace a worker page's context after max_navigations pages or past max_rss_mb"""
+        self.governor.max_navigations = max_navigations
+        self.governor.max_rss_mb = max_rss_mb
+
+    def set_seen_store(self, path: str, capacity: Optional[int] = None) -> None:
+        """Skip contacts saved by earlier runs, adding this run's to path.
+
+        With capacity, the file is a fixed-size Bloom filter for that many
+        contacts instead of an exact set.
+        """
+        self.contact_stage.seen = open_seen_store(path, capacity)
+
+    def set_metrics_file(self, path: str) -> None:
+        """Append stage timings and event counts to a JSON lines file"""
+        self.metrics.events_path = path
+
+    def set_archive(self, directory: str) -> None:
+        """Record every fetched posting page in an archive directory"""
+        self.page_archive = PageArchive(directory)
+
+    def open_context(self, playwright: Playwright) -> Tuple[Browser, BrowserContext]:
+        """Launch the browser and create a context with request blocking"""
+        browser = open_browser(playwright, self.launch_options, self.browser_daemon_url)
+        if Path(self.session_file).exists():
+            context = browser.new_context(storage_state=self.session_file)
+        else:
+            context = browser.new_context()
+        self.request_blocker.install(context)
+        return browser, context
+
+    def is_logged_in(self, page: Page) -> bool:
+        """Check whether the current page shows a logged-in header"""
+        return page.query_selector(self.logged_in_selector) is not None
+
+    def ensure_login(self, context: BrowserContext, page: Page) -> None:
+        """Reuse the saved session, or wait for a manual login and save it"""
+        page.goto(self.base_url)
+        if self.is_logged_in(page):
+            print("Restored saved login session")
+            return
+        if not self.interactive_login:
+            print("No valid login session, continuing without login")
+            return
+
+        while not self.is_logged_in(page):
+            answer = input(
+                "Please login in the browser, then press Enter "
+                "(or type 'skip' to continue without login): "
+            )
+            if answer.strip().lower() == "skip":
+                return
+
+        context.storage_state(path=self.session_file)
+        print(f"Login session saved to {self.session_file}")
+
+    def print_run_summary(self) -> None:
+        """Print request, pacing and stage timing statistics for the run"""
+        print(self.request_blocker.summary())
+        print(self.rate_limiter.summary())
+        print(self.governor.summary())
+        print(self.contact_stage.summary())
+        print(self.metrics.summary())
+        print(self.retry_queue.summary())
+        self.metrics.close()
+
+    def count_error(self, e: Exception) -> None:
+        is_timeout = isinstance(e, PlaywrightTimeoutError)
+        self.metrics.count("timeouts" if is_timeout else "errors")
+
     def save_to_csv(self, filename: str) -> None:
         """Save collected data to CSV file"""
-        with open(filename, "w", encoding="utf-8", newline="") as f:
+        with self.metrics.stage("output_write"), open(
+            filename, "w", encoding="utf-8", newline=""
+        ) as f:
             writer = csv.writer(f)
             writer.writerow(["Company Name", "URL"])
             for name, url in self.recruit_urls.items():
                 writer.writerow([name, url])
 
-    def save_email_results(self, filename: str) -> None:
-        """Save email collection results to CSV file"""
-        with open(filename, "w", encoding="utf-8", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(
-                [
-                    "Company Name",
-                    "Email",
-                    "Position Name",
-                    "Industry",
-                    "Employees",
-                    "Established Year",
-                    "Company Size",
-                    "Homepage",
-                ]
-            )
-            writer.writerows(self.scrape_results)
-
-    def process_job_listing(self, item) -> tuple[str, str]:
-        """Extract company name and job URL from a listing item"""
-        name_div = item.query_selector("div.list-section-corp")
-        name = name_div.query_selector("a").text_content().strip()
-        title_div = item.query_selector("div.information-title")
-        link = title_div.query_selector("a").get_attribute("href")
-        return name, self.base_url + link
-
-    def process_page(self, page: Page, page_no: int, total_pages: int = 100) -> bool:
-        """Process a single page of job listings. Returns False if no more listings."""
-        url = self.search_url + str(page_no)
-        page.goto(url)
-
-        list_container = page.query_selector("article.list")
-        if not list_container:
+    def open_results(self, filename: str) -> None:
+        """Start the email results CSV that add_result appends to"""
+        self._results_file = open(filename, "w", encoding="utf-8", newline="")
+        self._results_writer = csv.writer(self._results_file)
+        self._results_writer.writerow(RESULT_COLUMNS)
+        self._results_file.flush()
+
+    def close_results(self) -> None:
+        self.contact_stage.save()
+        if self._results_file is not None:
+            self._results_file.close()
+            self._results_file = None
+            self._results_writer = None
+
+    def fetch_page(self, page: Page, url: str) -> str:
+        """Open url at the adaptive pace and return its HTML.
+
+        A security check page cuts the rate for every worker sharing the
+        limiter, then waits until the check is passed and reads the page.
+        """
+        with self.metrics.stage("pacing"):
+            self.rate_limiter.acquire()
+        with self.metrics.stage("navigation"):
+            page.goto(url)
+        with self.metrics.stage("snapshot"):
+            html = page.content()
+        if not is_security_page(html):
+            self.rate_limiter.record_success()
+            return html
+
+        # Slow down for every request, then wait for manual intervention
+        self.rate_limiter.record_challenge()
+        self.metrics.count("challenges")
+        print("\n보안 체크 페이지 감지! 수동으로 처리해주세요...")
+        print(self.rate_limiter.summary())
+        while is_security_page(html):
+            print("아직 보안 체크가 필요합니다. 계속 대기중...")
+            time.sleep(self.challenge_poll_interval)
+            if self.reload_on_challenge:
+                page.reload()
+            html = page.content()
+        print("보안 체크 통과, 계속 진행합니다.")
+        return html
+
+    def fetch_listing(
+        self, page: Page, page_no: int
+    ) -> Optional[List[Tuple[str, str]]]:
+        """Load a search result page and return its (company, url) listings.
+
+        Returns None when the page has no result list.
+        """
+        self.fetch_page(page, self.search_url + str(page_no))
+        with self.metrics.stage("extraction"):
+            listings = read_listings(page)
+        if listings is None:
+            return None
+        return [(name, self.base_url + link) for name, link in listings]
+
+    def listing_pages(
+        self, pages: PageRecycler
+    ) -> Iterator[Tuple[int, Optional[List[Tuple[str, str]]]]]:
+        """Yield (page_no, listings) for search pages 1, 2, ... in page order.
+
+        With search_concurrency > 1, pages are loaded by that many browsers at
+        once. Stop iterating to stop loading pages.
+        """
+        if self.search_concurrency > 1:
+            yield from self.fetch_listings_concurrently(pages.context.storage_state())
+            return
+
+        page_no = 1
+        while True:
+            yield page_no, self.fetch_listing(pages.page, page_no)
+            pages.navigated()
+            page_no += 1
+
+    def fetch_listings_concurrently(
+        self, storage_state: dict
+    ) -> Iterator[Tuple[int, Optional[List[Tuple[str, str]]]]]:
+        """Load search pages with search_concurrency browsers, in page order.
+
+        Like the email workers, each browser runs in its own thread with its
+        own Playwright driver. Workers claim the next page number, but stay
+        within a window of pages ahead of the last one yielded, and none
+        claims a page past the first empty one.
+        """
+        condition = threading.Condition()
+        window = self.search_concurrency * 2
+        loaded: Dict[int, object] = {}  # page_no -> listings or the exception
+        next_page = 1
+        last_yielded = 0
+        last_page: Optional[int] = None
+        stopped = False
+        running = self.search_concurrency
+
+        def worker() -> None:
+            nonlocal next_page, last_page, running
+            try:
+                with sync_playwright() as playwright:
+                    browser = open_browser(
+                        playwright, self.launch_options, self.browser_daemon_url
+                    )
+                    pages = PageRecycler(
+                        browser,
+                        self.governor,
+                        self.request_blocker.install,
+                        storage_state=storage_state,
+                    )
+                    try:
+                        while True:
+                            with condition:
+                                while not stopped and next_page > last_yielded + window:
+                                    condition.wait()
+                                if stopped or (
+                                    last_page is not None and next_page > last_page
+                                ):
+                                    break
+                                page_no = next_page
+                                next_page += 1
+
+                            try:
+                                result = self.fetch_listing(pages.page, page_no)
+                            except Exception as e:
+                                self.count_error(e)
+                                result = e
+                            with condition:
+                                loaded[page_no] = result
+                                if not result and (
+                                    last_page is None or page_no < last_page
+                                ):
+                                    last_page = page_no
+                                condition.notify_all()
+                            pages.navigated()
+                    finally:
+                        browser.close()
+            except Exception as e:
+                print(f"Search browser stopped: {str(e)}")
+            finally:
+                with condition:
+                    running -= 1
+                    condition.notify_all()
+
+        workers = [
+            threading.Thread(target=worker, daemon=True)
+            for _ in range(self.search_concurrency)
+        ]
+        for thread in workers:
+            thread.start()
+
+        try:
+            page_no = 1
+            while True:
+                with condition:
+                    while page_no not in loaded and running:
+                        condition.wait()
+                    if page_no not in loaded:
+                        print("All search browsers stopped")
+                        return
+                    result = loaded.pop(page_no)
+                    last_yielded = page_no
+                    condition.notify_all()
+                if isinstance(result, Exception):
+                    raise result
+                yield page_no, result
+                if not result:
+                    return
+                page_no += 1
+        finally:
+            with condition:
+                stopped = True
+                condition.notify_all()
+            for thread in workers:
+                thread.join()
+
+    def add_listings(
+        self,
+        page_no: int,
+        listings: Optional[List[Tuple[str, str]]],
+        total_pages: int = 100,
+        on_listing: Optional[Callable[[str, str], bool]] = None,
+    ) -> bool:
+        """Add the listings of one search page. Returns False if no more listings.
+
+        on_listing is called with each (company, url) as it is found; returning
+        False from it stops the listing.
+        """
+        if not listings:
             print("No more job listings")
             return False
 
-        list_items = list_container.query_selector_all("article.list-item")
-        for item in list_items:
+        for name, url in listings:
             if len(self.recruit_urls) >= self.max_companies:
                 print(f"\nReached {self.max_companies} companies, ending process...")
                 return False
 
-            name, url = self.process_job_listing(item)
+            # Keep the first posting of each company
+            key = company_key(name)
+            if key in self._company_keys:
+                self.metrics.count("duplicate_companies")
+                continue
+            self._company_keys.add(key)
             self.recruit_urls[name] = url
+            if on_listing and not on_listing(name, url):
+                return False
 
         progress = (page_no / total_pages) * 100
         print(
             f"Page {page_no} processed. Progress: {progress:.1f}% | "
-            f"Companies collected: {len(self.recruit_urls)}/{self.max_companies}"
+            f"Companies collected: {len(self.recruit_urls)}/{self.max_companies} | "
+            f"Rate: {self.rate_limiter.rate:.2f} req/s"
         )
         return True
 
+    def collect_listings(
+        self,
+        pages: PageRecycler,
+        on_listing: Optional[Callable[[str, str], bool]] = None,
+    ) -> None:
+        """Read search pages in page order until a page is empty or a limit is hit"""
+        for page_no, listings in self.listing_pages(pages):
+            if not self.add_listings(page_no, listings, on_listing=on_listing):
+                break
+
     def extract_email(self, text: str) -> Optional[str]:
         """Extract email from text using regex"""
-        email_pattern = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
-        match = re.search(email_pattern, text)
-        return match.group(0).strip() if match else None
+        return extract_email(text)
 
-    def collect_email_from_page(self, page: Page, company: str, url: str) -> bool:
-        """Collect email and other information from a job posting page. Returns False if should stop."""
-        try:
-            page.goto(url)
+    def add_result(self, result: Tuple[str, str, str, str, str, str, str, str]) -> str:
+        """Add a scrape result unless it is a duplicate.
 
-            # Check for security page
-            security_check = page.query_selector("p.reasonExp")
-            if security_check and "보안정책" in security_check.text_content():
-                print("\n보안 체크 페이지 감지! 수동으로 처리해주세요...")
-                time.sleep(30)  # Wait for manual intervention
-
-                # Check if still on security page
-                security_check = page.query_selector("p.reasonExp")
-                while security_check and "보안정책" in security_check.text_content():
-                    print("아직 보안 체크가 필요합니다. 계속 대기중...")
-                    time.sleep(10)
-                    security_check = page.query_selector("p.reasonExp")
-
-                print("보안 체크 통과, 계속 진행합니다.")
-
-            email_element = page.query_selector("span.tahoma a.devChargeEmail")
-
-            if email_element:
-                email_text = email_element.text_content()
-                email = self.extract_email(email_text)
-                if email:
-                    print(f"Found email for {company}: {email}")
-
-                    # 1. 직종명
-                    position_name = ""
-                    position_element = page.query_selector(
-                        "article.artReadJobSum h3.hd_3"
-                    )
-                    if position_element:
-                        position_name = (
-                            position_element.text_content()
-                            .strip()
-                            .split("\n")[-1]
-                            .strip()
-                        )
-                    print(f"Position name: {position_name}")
-
-                    # Company info from tbList
-                    company_info = {
-                        "industry": "",
-                        "employees": "",
-                        "established": "",
-                        "company_size": "",
-                        "homepage": "",
-                    }
-
-                    # Find all dt/dd pairs in company info section
-                    info_list = page.query_selector("div.tbCol.tbCoInfo dl.tbList")
-                    if info_list:
-                        dt_elements = info_list.query_selector_all("dt")
-                        dd_elements = info_list.query_selector_all("dd")
-
-                        for dt, dd in zip(dt_elements, dd_elements):
-                            label = dt.text_content().strip()
-
-                            if "산업(업종)" in label:
-                                company_info["industry"] = (
-                                    dd.query_selector("text").text_content().strip()
-                                )
-                            elif "사원수" in label:
-                                employees = dd.query_selector("span.tahoma")
-                                if employees:
-                                    company_info["employees"] = (
-                                        employees.text_content().strip()
-                                    )
-                            elif "설립년도" in label:
-                                established = dd.query_selector("span.tahoma")
-                                if established:
-                                    company_info["established"] = (
-                                        established.text_content().strip()
-                                    )
-                            elif "기업형태" in label:
-                                company_info["company_size"] = (
-                                    dd.text_content()
-                                    .replace("\n", " ")
-                                    .strip()
-                                    .split()[0]  # Only take the first part
-                                )
-                            elif "홈페이지" in label:
-                                homepage = dd.query_selector("a.devCoHomepageLink")
-                                if homepage:
-                                    company_info["homepage"] = homepage.get_attribute(
-                                        "href"
-                                    )
-
-                    print(f"Industry: {company_info['industry']}")
-                    print(f"Employees: {company_info['employees']}")
-                    print(f"Established: {company_info['established']}")
-                    print(f"Company Size: {company_info['company_size']}")
-                    print(f"Homepage: {company_info['homepage']}")
-
-                    self.scrape_results.append(
-                        (
-                            company,
-                            email,
-                            position_name,
-                            company_info["industry"],
-                            company_info["employees"],
-                            company_info["established"],
-                            company_info["company_size"],
-                            company_info["homepage"],
-                        )
-                    )
+        Returns RESULT_ADDED, RESULT_DUPLICATE, or RESULT_REJECTED when
+        max_emails was already reached and the result was not written.
+        """
+        with self._results_lock:
+            if self.result_count >= self.max_emails:
+                return RESULT_REJECTED
 
-                    if len(self.scrape_results) >= self.max_emails:
-                        print(f"\nReached {self.max_emails} results, ending process...")
-                        return False
-                else:
-                    print(f"No valid email format found for {company}")
-            else:
-                print(f"No email element found for {company}")
+            contact = self.contact_stage.process(result)
+            if contact is None:
+                print(f"Skipping duplicate result for {result[0]}: {result[1]}")
+                self.metrics.count("duplicates")
+                return RESULT_DUPLICATE
 
+            with self.metrics.stage("output_write"):
+                self._results_writer.writerow(contact)
+                self._results_file.flush()
+            self.result_count += 1
+            if self.result_count >= self.max_emails:
+                print(f"\nReached {self.max_emails} results, ending process...")
+            return RESULT_ADDED
+
+    def has_room(self) -> bool:
+        """Check whether more results can still be added"""
+        return self.result_count < self.max_emails
+
+    def extract_posting(self, company: str, html: str) -> Optional[Tuple]:
+        """Extract the result row from a saved posting page's HTML"""
+        with self.metrics.stage("extraction"):
+            posting = parse_posting(html)
+        return self.posting_result(company, posting)
+
+    def posting_result(self, company: str, posting: dict) -> Optional[Tuple]:
+        """Build the result row from parsed posting fields, or None without an email"""
+        if posting["email_text"] is None and not posting["position_name"]:
+            raise MissingElementError("Posting content not found")
+
+        if posting["email_text"] is None:
+            print(f"No email element found for {company}")
+            self.metrics.count("no_email")
+            return None
+
+        email = posting["email"]
+        if not email:
+            print(f"No valid email format found for {company}")
+            self.metrics.count("no_email")
+            return None
+
+        print(f"Found email for {company}: {email}")
+
+        position_name = posting["position_name"]
+        print(f"Position name: {position_name}")
+
+        company_info = posting["company_info"]
+        print(f"Industry: {company_info['industry']}")
+        print(f"Employees: {company_info['employees']}")
+        print(f"Established: {company_info['established']}")
+        print(f"Company Size: {company_info['company_size']}")
+        print(f"Homepage: {company_info['homepage']}")
+
+        return (
+            company,
+            email,
+            position_name,
+            company_info["industry"],
+            company_info["employees"],
+            company_info["established"],
+            company_info["company_size"],
+            company_info["homepage"],
+        )
+
+    def collect_email_from_page(self, page: Page, company: str, url: str) -> bool:
+        """Collect email and other information from a job posting page. Returns False if should stop."""
+        if self.company_cache.is_fresh(company, url):
+            print(f"Skipping {company}, already visited in a recent run")
+            self.metrics.count("skipped")
             return True
 
+        try:
+            html = self.fetch_page(page, url)
+            if self.page_archive is not None:
+                self.page_archive.put(url, html, company=company)
+            with self.metrics.stage("extraction"):
+                posting = read_posting(page)
+            result = self.posting_result(company, posting)
+
+            # A result turned away by the limit is not saved anywhere, so the
+            # posting must not be marked as visited either
+            if result is None or self.add_result(result) != RESULT_REJECTED:
+                self.company_cache.store(company, url, result or ())
+            return self.has_room()
+
         except Exception as e:
             print(f"Error processing {company}: {str(e)}")
+            self.count_error(e)
+            self.retry_queue.add_failure({"Company Name": company, "URL": url}, e)
             return True
 
     def collect_urls(self) -> None:
         """Collect all job posting URLs"""
         with sync_playwright() as playwright:
-            browser = playwright.chromium.launch(headless=False)
-            context = browser.new_context()
-            page = context.new_page()
+            browser, context = self.open_context(playwright)
+            pages = PageRecycler(
+                browser, self.governor, self.request_blocker.install, context=context
+            )
 
-            # Initial page load and wait for login
-            page.goto(self.search_url + "1")
-            print("Please login now...")
-            time.sleep(60)
+            # Reuse the saved session or wait for login
+            self.ensure_login(pages.context, pages.page)
 
-            # Scrape all pages
-            page_no = 1
-            while self.process_page(page, page_no):
-                page_no += 1
-                time.sleep(2)
-
-            # Save results
-            urls_filename = f"recruit_urls_{self.timestamp}.csv"
-            self.save_to_csv(urls_filename)
-            print(f"\nURLs saved to {urls_filename}")
-            print(f"Total companies collected: {len(self.recruit_urls)}")
+            # Scrape all pages, keeping what was found if a page fails
+            try:
+                self.collect_listings(pages)
+            finally:
+                urls_filename = f"recruit_urls_{self.timestamp}.csv"
+                self.save_to_csv(urls_filename)
+                print(f"\nURLs saved to {urls_filename}")
+                print(f"Total companies collected: {len(self.recruit_urls)}")
+                self.print_run_summary()
 
             browser.close()
 
-    def collect_emails_from_csv(self, csv_filename: str) -> None:
-        """Process URLs from CSV file to collect emails"""
+    def start_email_workers(
+        self,
+        storage_state: dict,
+        tasks: queue.Queue,
+        stop: threading.Event,
+        producer_done: threading.Event,
+        total: Optional[int] = None,
+    ) -> List[threading.Thread]:
+        """Start browsers that collect emails for (idx, row) items from tasks.
+
+        Sync Playwright objects can only be used from the thread that created
+        them, so each worker thread starts its own Playwright driver and
+        browser (a separate Chromium process, and window when headed), with a
+        context restored from the logged-in context's storage state. This
+        costs one browser's memory per worker. Workers exit once stop is
+        set, or once producer_done is set and tasks is empty.
+        """
+
+        def worker() -> None:
+            try:
+                with sync_playwright() as playwright:
+                    browser = open_browser(
+                        playwright, self.launch_options, self.browser_daemon_url
+                    )
+                    pages = PageRecycler(
+                        browser,
+                        self.governor,
+                        self.request_blocker.install,
+                        storage_state=storage_state,
+                    )
+                    try:
+                        while not stop.is_set():
+                            try:
+                                idx, row = tasks.get(timeout=1)
+                            except queue.Empty:
+                                if producer_done.is_set():
+                                    break
+                                continue
+
+                            company = row["Company Name"]
+                            position = f"{idx}/{total}" if total else str(idx)
+                            print(
+                                f"\nProcessing {company}... ({position} | "
+                                f"Emails collected: {self.result_count}/{self.max_emails})"
+                            )
+                            if not self.collect_email_from_page(
+                                pages.page, company, row["URL"]
+                            ):
+                                stop.set()  # Stop all workers once max_emails is reached
+                            pages.navigated()
+                    finally:
+                        browser.close()
+            except Exception as e:
+                print(f"Email browser stopped: {str(e)}")
+
+        workers = [
+            threading.Thread(target=worker, daemon=True)
+            for _ in range(self.concurrency)
+        ]
+        for thread in workers:
+            thread.start()
+        return workers
+
+    def collect_emails_concurrently(
+        self, context: BrowserContext, rows: List[Dict[str, str]]
+    ) -> None:
+        """Collect emails from rows with several browsers working in parallel"""
+        tasks = queue.Queue()
+        for idx, row in enumerate(rows, 1):
+            tasks.put((idx, row))
+        producer_done = threading.Event()
+        producer_done.set()
+
+        workers = self.start_email_workers(
+            context.storage_state(), tasks, threading.Event(), producer_done, len(rows)
+        )
+        for thread in workers:
+            thread.join()
+
+    def collect_pipeline(self) -> None:
+        """Collect job posting URLs and emails at the same time.
+
+        Search pages are read in this thread and every (company, url) found is
+        put on a bounded queue consumed by the email browsers. A full queue holds
+        the search back, and reaching max_emails stops both sides.
+        """
         with sync_playwright() as playwright:
-            browser = playwright.chromium.launch(headless=False)
-            context = browser.new_context()
-            page = context.new_page()
+            browser, context = self.open_context(playwright)
+            pages = PageRecycler(
+                browser, self.governor, self.request_blocker.install, context=context
+            )
+
+            # Reuse the saved session or wait for login
+            self.ensure_login(pages.context, pages.page)
 
-            # Initial page load and wait for login
-            page.goto(self.base_url)
-            print("Please login now...")
-            time.sleep(60)
-
-            # Count total companies to process
-            total_to_process = min(
-                self.max_companies_to_process,
-                sum(
-                    1 for _ in csv.DictReader(open(csv_filename, "r", encoding="utf-8"))
-                ),
+            results_filename = f"email_results_{self.timestamp}.csv"
+            self.open_results(results_filename)
+            tasks = queue.Queue(maxsize=self.concurrency * 2)
+            stop = threading.Event()
+            producer_done = threading.Event()
+            workers = self.start_email_workers(
+                pages.context.storage_state(), tasks, stop, producer_done
             )
+            listed = 0
 
-            # Read URLs from CSV
-            with open(csv_filename, "r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for idx, row in enumerate(reader, 1):
-                    if idx > self.max_companies_to_process:
-                        print(
-                            f"\nReached maximum companies to process ({self.max_companies_to_process})"
-                        )
+            def on_listing(company: str, url: str) -> bool:
+                nonlocal listed
+                listed += 1
+                while not stop.is_set():
+                    # Workers only exit early when they fail, e.g. on a launch error
+                    if not any(thread.is_alive() for thread in workers):
+                        print("All email browsers stopped, ending the search...")
+                        stop.set()
                         break
+                    try:
+                        tasks.put(
+                            (listed, {"Company Name": company, "URL": url}), timeout=1
+                        )
+                        return True
+                    except queue.Full:
+                        continue
+                return False
 
-                    company = row["Company Name"]
-                    url = row["URL"]
-                    progress = (idx / total_to_process) * 100
-                    print(
-                        f"\nProcessing {company}... ({progress:.1f}% | {idx}/{total_to_process} | "
-                        f"Emails collected: {len(self.scrape_results)}/{self.max_emails})"
-                    )
+            try:
+                try:
+                    self.collect_listings(pages, on_listing)
+                finally:
+                    producer_done.set()
+                    for thread in workers:
+                        thread.join()
+
+                if not stop.is_set():
+                    self.retry_failures(pages)
+            finally:
+                # Keep what was collected even if the search failed
+                self.close_results()
+                urls_filename = f"recruit_urls_{self.timestamp}.csv"
+                self.save_to_csv(urls_filename)
+                print(f"\nURLs saved to {urls_filename}")
+                print(f"Results saved to {results_filename}")
+                print(f"Total companies collected: {len(self.recruit_urls)}")
+                print(f"Total emails collected: {self.result_count}")
+                self.print_run_summary()
+            browser.close()
+
+    def process_rows(self, pages: PageRecycler, rows: List[Dict[str, str]]) -> None:
+        """Collect emails from rows, with parallel browsers if concurrency > 1"""
+        if self.concurrency > 1:
+            self.collect_emails_concurrently(pages.context, rows)
+            return
+
+        total_to_process = len(rows)
+        for idx, row in enumerate(rows, 1):
+            company = row["Company Name"]
+            url = row["URL"]
+            progress = (idx / total_to_process) * 100
+            print(
+                f"\nProcessing {company}... ({progress:.1f}% | {idx}/{total_to_process} | "
+                f"Emails collected: {self.result_count}/{self.max_emails})"
+            )
+
+            if not self.collect_email_from_page(pages.page, company, url):
+                break  # Stop if we've reached max_emails
+            pages.navigated()
+
+    def retry_failures(self, pages: PageRecycler) -> None:
+        """Try failed postings again with backoff until max_emails is reached"""
+        while self.has_room():
+            rows = self.retry_queue.next_round()
+            if not rows:
+                break
+            self.metrics.count("retries", len(rows))
+            self.process_rows(pages, rows)
+
+    def collect_emails_from_rows(
+        self, rows: List[Dict[str, str]], results_filename: str
+    ) -> None:
+        """Collect emails for rows of "Company Name" and "URL" and save them"""
+        with sync_playwright() as playwright:
+            browser, context = self.open_context(playwright)
+            pages = PageRecycler(
+                browser, self.governor, self.request_blocker.install, context=context
+            )
 
-                    if not self.collect_email_from_page(page, company, url):
-                        break  # Stop if we've reached max_emails
+            # Reuse the saved session or wait for login
+            self.ensure_login(pages.context, pages.page)
 
-                    # time.sleep(random.randint(1, 3)
+            self.open_results(results_filename)
+            try:
+                self.process_rows(pages, rows)
+                self.retry_failures(pages)
+            finally:
+                self.close_results()
 
             browser.close()
+            print(f"\nResults saved to {results_filename}")
+            print(f"Total emails collected: {self.result_count}")
+            self.print_run_summary()
+
+    def collect_emails_from_csv(
+        self,
+        csv_filename: str,
+        shard_index: Optional[int] = None,
+        shard_count: int = 1,
+        results_filename: Optional[str] = None,
+    ) -> None:
+        """Process URLs from CSV file to collect emails.
+
+        With shard_index, only the rows of that shard (out of shard_count) are
+        processed, and results go to a per-shard file for merge_email_results.
+        """
+        # Read URLs from CSV
+        with open(csv_filename, "r", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        if len(rows) > self.max_companies_to_process:
+            print(
+                f"\nReached maximum companies to process ({self.max_companies_to_process})"
+            )
+            rows = rows[: self.max_companies_to_process]
+        if shard_index is not None:
+            rows = [
+                row for row in rows if shard_of(row["URL"], shard_count) == shard_index
+            ]
+            # A shard collects its share of max_emails, so the merged results
+            # are not just those of whichever shard ran fastest
+            self.set_max_emails(math.ceil(self.max_emails / shard_count))
+            print(
+                f"Shard {shard_index}/{shard_count}: {len(rows)} companies, "
+                f"up to {self.max_emails} emails"
+            )
 
-            # Save results
+        if results_filename is None:
             results_filename = f"email_results_{self.timestamp}.csv"
-            self.save_email_results(results_filename)
-            print(f"\nResults saved to {results_filename}")
-            print(f"Total emails collected: {len(self.scrape_results)}")
+            if shard_index is not None:
+                results_filename = shard_path(results_filename, shard_index)
+        self.collect_emails_from_rows(rows, results_filename)
+
+    def replay_failures(self, dead_letter_file: str) -> None:
+        """Collect emails only for the postings in a dead-letter file"""
+        rows = load_dead_letters(dead_letter_file)
+        print(f"Replaying {len(rows)} failed postings from {dead_letter_file}")
+        self.collect_emails_from_rows(rows, f"email_results_{self.timestamp}.csv")
+
+    def reextract_archive(self, archive_dir: str) -> None:
+        """Run the posting extraction over recorded pages, without a browser.
+
+        Lets a changed selector or a new field be checked against every
+        archived posting at parse speed.
+        """
+        archive = PageArchive(archive_dir)
+        print(f"Re-extracting {len(archive)} archived pages from {archive_dir}")
+        results_filename = f"email_results_{self.timestamp}.csv"
+        self.open_results(results_filename)
+        for entry in archive.entries():
+            if "company" not in entry:
+                continue
+            try:
+                result = self.extract_posting(entry["company"], archive.read(entry))
+            except MissingElementError as e:
+                print(f"Error processing {entry['company']}: {str(e)}")
+                self.count_error(e)
+                continue
+            if result and self.add_result(result) == RESULT_REJECTED:
+                break
+
+        self.close_results()
+        print(f"\nRe-extracted {self.result_count} results")
+        print(f"Results saved to {results_filename}")
+        print(self.metrics.summary())
+        self.metrics.close()
+
+    def shard_settings(self) -> dict:
+        """Settings a shard process needs to collect like this scraper"""
+        return {
+            "timestamp": self.timestamp,
+            "max_emails": self.max_emails,
+            "max_companies_to_process": self.max_companies_to_process,
+            "concurrency": self.concurrency,
+            "headless": self.launch_options["headless"],
+            "browser_daemon_url": self.browser_daemon_url,
+            "session_file": self.session_file,
+            "archive_dir": self.page_archive.root if self.page_archive else None,
+            "metrics_file": self.metrics.events_path,
+            "max_navigations": self.governor.max_navigations,
+            "max_rss_mb": self.governor.max_rss_mb,
+        }
+
+    def collect_emails_sharded(self, csv_filename: str, shard_count: int) -> None:
+        """Collect emails with shard_count processes, each with its own browser.
+
+        Login happens once here so every process can restore the saved
+        session; the shard results are then merged into one file.
+        """
+        with sync_playwright() as playwright:
+            browser, context = self.open_context(playwright)
+            page = context.new_page()
+            self.ensure_login(context, page)
+            browser.close()
+
+        results_filename = f"email_results_{self.timestamp}.csv"
+        paths = [shard_path(results_filename, i) for i in range(shard_count)]
+        run_processes(
+            run_email_shard,
+            [
+                (self.shard_settings(), csv_filename, i, shard_count, path)
+                for i, path in enumerate(paths)
+            ],
+        )
+        self.merge_email_results(csv_filename, paths, results_filename)
+
+    def merge_email_results(
+        self, csv_filename: str, paths: List[str], results_filename: str
+    ) -> None:
+        """Merge shard results in recruit CSV order, keeping max_emails results.
+
+        Each shard only dropped duplicate contacts among its own results, so
+        the merged rows go through a fresh contact stage as well.
+        """
+        with open(csv_filename, "r", encoding="utf-8") as f:
+            position: Dict[str, int] = {}
+            for idx, row in enumerate(csv.DictReader(f)):
+                position.setdefault(company_key(row["Company Name"]), idx)
+
+        # Shard rows hold normalized company names, so match on company_key
+        def merge_order(row: Dict[str, str]) -> int:
+            return position.get(company_key(row["Company Name"]), len(position))
+
+        # Contacts from earlier runs (set_seen_store) are dropped here, since
+        # the shard processes do not share the seen store
+        stage = ContactStage(
+            company="Company Name",
+            email="Email",
+            url="Homepage",
+            seen=self.contact_stage.seen,
+        )
+        count = merge_csv_files(
+            paths,
+            results_filename,
+            ["Company Name", "Email"],
+            sort_key=merge_order,
+            limit=self.max_emails,
+            row_filter=stage.process,
+        )
+        stage.save()
+        print(f"\nMerged {count} results into {results_filename}")
+        print(stage.summary())
+
+
+def run_email_shard(
+    settings: dict,
+    csv_filename: str,
+    shard_index: int,
+    shard_count: int,
+    results_filename: str,
+) -> None:
+    """Collect emails for one shard in a separate process"""
+    scraper = JobScraper()
+    scraper.timestamp = settings["timestamp"]
+    scraper.set_max_emails(settings["max_emails"])
+    scraper.set_companies_to_process(settings["max_companies_to_process"])
+    scraper.set_concurrency(settings["concurrency"])
+    scraper.set_headless(settings["headless"])
+    scraper.browser_daemon_url = settings["browser_daemon_url"]
+    scraper.session_file = settings["session_file"]
+    scraper.interactive_login = False
+    scraper.set_recycling(settings["max_navigations"], settings["max_rss_mb"])
+    if settings["archive_dir"]:
+        scraper.set_archive(settings["archive_dir"])
+    if settings["metrics_file"]:
+        scraper.set_metrics_file(shard_path(settings["metrics_file"], shard_index))
+    scraper.retry_queue.dead_letter_path = shard_path(
+        scraper.retry_queue.dead_letter_path, shard_index
+    )
+    scraper.collect_emails_from_csv(
+        csv_filename, shard_index, shard_count, results_filename
+    )
+
+
+def ask_int(prompt: str, default: int) -> int:
+    """Ask for a number, using default for empty or invalid input"""
+    try:
+        return int(input(f"{prompt} (default {default}): ") or default)
+    except ValueError:
+        print(f"Invalid input, using default value of {default}")
+        return default
 
 
 def main():
     scraper = JobScraper()
 
     # Choose operation mode
-    mode = input("Enter mode (1 for collect URLs, 2 for collect emails): ")
+    mode = input(
+        "Enter mode (1 for collect URLs, 2 for collect emails, 3 for both at once, "
+        "4 for one shard of emails, 5 for merge shard results, "
+        "6 for replay failed postings, 7 for re-extract from an archive): "
+    )
+
+    if mode in ("2", "3", "4", "6"):
+        # Optionally keep the fetched postings for re-extraction with mode 7
+        archive_dir = input("Enter directory to record postings (empty to skip): ")
+        if archive_dir:
+            scraper.set_archive(archive_dir)
+    if mode in ("1", "2", "3", "4", "6"):
+        # Optionally keep every stage timing, e.g. to compare runs
+        metrics_file = input("Enter file for timing events (empty to skip): ")
+        if metrics_file:
+            scraper.set_metrics_file(metrics_file)
+    if mode in ("2", "3", "6"):
+        # Optionally skip emails already collected by earlier runs
+        seen_file = input("Enter file of contacts from earlier runs (empty to skip): ")
+        if seen_file:
+            scraper.set_seen_store(seen_file)
 
     if mode == "1":
         # Set maximum number of companies to collect
-        try:
-            max_companies = int(
-                input("Enter number of companies to collect (default 1000): ") or "1000"
-            )
-            scraper.set_max_companies(max_companies)
-        except ValueError:
-            print("Invalid input, using default value of 1000")
-            scraper.set_max_companies(1000)
+        scraper.set_max_companies(ask_int("Enter number of companies to collect", 1000))
+        scraper.set_search_concurrency(
+            ask_int("Enter number of browsers loading search pages", 2)
+        )
 
         # Collect URLs
         scraper.collect_urls()
-    elif mode == "2":
-        # Set maximum number of emails to collect
-        try:
-            max_emails = int(
-                input("Enter number of emails to collect (default 200): ") or "200"
-            )
-            scraper.set_max_emails(max_emails)
-        except ValueError:
-            print("Invalid input, using default value of 200")
-            scraper.set_max_emails(200)
+    elif mode in ("2", "4"):
+        # Set limits and number of browsers collecting emails in parallel
+        scraper.set_max_emails(ask_int("Enter number of emails to collect", 200))
+        scraper.set_companies_to_process(
+            ask_int("Enter number of companies to process", 1000)
+        )
+        scraper.set_concurrency(
+            ask_int("Enter number of parallel browsers (one window each)", 1)
+        )
+        csv_filename = (
+            input(f"Enter recruit URL CSV (default {DEFAULT_URLS_CSV}): ")
+            or DEFAULT_URLS_CSV
+        )
 
-        # Set maximum number of companies to process
-        try:
-            max_companies = int(
-                input("Enter number of companies to process (default 1000): ") or "1000"
-            )
-            scraper.set_companies_to_process(max_companies)
-        except ValueError:
-            print("Invalid input, using default value of 1000")
-            scraper.set_companies_to_process(1000)
-
-        # Collect emails from existing CSV
-        csv_filename = "recruit_urls_20250207_112942.csv"
-        scraper.collect_emails_from_csv(csv_filename)
+        if mode == "2":
+            # Collect emails from existing CSV, optionally in several processes
+            processes = ask_int("Enter number of worker processes", 1)
+            if processes > 1:
+                scraper.collect_emails_sharded(csv_filename, processes)
+            else:
+                scraper.collect_emails_from_csv(csv_filename)
+        else:
+            # Collect this machine's shard; merge the shard files with mode 5
+            shard_count = ask_int("Enter total number of shards", 2)
+            shard_index = ask_int("Enter shard index of this machine", 0)
+            scraper.collect_emails_from_csv(csv_filename, shard_index, shard_count)
+    elif mode == "3":
+        # Set maximum number of emails and browsers collecting them in parallel
+        scraper.set_max_emails(ask_int("Enter number of emails to collect", 200))
+        scraper.set_concurrency(
+            ask_int("Enter number of parallel browsers (one window each)", 2)
+        )
+        scraper.set_search_concurrency(
+            ask_int("Enter number of browsers loading search pages", 2)
+        )
+
+        # Collect URLs and emails together
+        scraper.collect_pipeline()
+    elif mode == "5":
+        # Merge shard results from several machines, keeping the email limit
+        scraper.set_max_emails(ask_int("Enter number of emails to keep", 200))
+        csv_filename = (
+            input(f"Enter recruit URL CSV (default {DEFAULT_URLS_CSV}): ")
+            or DEFAULT_URLS_CSV
+        )
+        paths = input("Enter shard result files separated by spaces: ").split()
+        scraper.merge_email_results(
+            csv_filename, paths, f"email_results_{scraper.timestamp}.csv"
+        )
+    elif mode == "6":
+        # Visit only the postings that failed in an earlier run
+        scraper.set_max_emails(ask_int("Enter number of emails to collect", 200))
+        scraper.set_concurrency(
+            ask_int("Enter number of parallel browsers (one window each)", 1)
+        )
+        dead_letter_file = input(
+            "Enter failed postings file (jobkorea_failed_*.jsonl): "
+        )
+        scraper.replay_failures(dead_letter_file)
+    elif mode == "7":
+        # Extract results from recorded postings without visiting the site
+        scraper.set_max_emails(ask_int("Enter number of emails to collect", 200))
+        scraper.reextract_archive(input("Enter archive directory: "))
     else:
         print("Invalid mode selected")
 
@@ -0,0 +1,80 @@
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Sequence
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.contacts import company_key  # noqa: E402
+
+DAY = 24 * 60 * 60
+
+
+class CompanyCache:
+    """On-disk record of job postings already visited, kept across runs.
+
+    Each row is keyed by (company_key(company), url), so spellings such as
+    "(주)회사" and "회사" share entries, and stores the extracted email and
+    company info with the time it was fetched. Entries older than the TTL are
+    treated as stale and visited again.
+    """
+
+    def __init__(self, path: str, ttl_days: float = 30):
+        self.path = path
+        self.ttl = ttl_days * DAY
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS postings (
+                    company TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    email TEXT NOT NULL DEFAULT '',
+                    position_name TEXT NOT NULL DEFAULT '',
+                    industry TEXT NOT NULL DEFAULT '',
+                    employees TEXT NOT NULL DEFAULT '',
+                    established TEXT NOT NULL DEFAULT '',
+                    company_size TEXT NOT NULL DEFAULT '',
+                    homepage TEXT NOT NULL DEFAULT '',
+                    fetched_at REAL NOT NULL,
+                    PRIMARY KEY (company, url)
+                )
+                """)
+            self._connection.commit()
+        return self._connection
+
+    def is_fresh(self, company: str, url: str) -> bool:
+        """Check whether the posting or an email for the company is within the TTL"""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT 1 FROM postings WHERE company = ? AND fetched_at >= ? "
+                    "AND (url = ? OR email != '') LIMIT 1",
+                    (company_key(company), cutoff, url),
+                )
+                .fetchone()
+            )
+        return row is not None
+
+    def store(self, company: str, url: str, result: Sequence[str] = ()) -> None:
+        """Record a visited posting with its scrape result, if any"""
+        fields = list(result[1:8]) if result else [""] * 7
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO postings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (company_key(company), url, *fields, time.time()),
+            )
+            connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
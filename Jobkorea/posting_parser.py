@@ -0,0 +1,205 @@
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.dom import parse_html  # noqa: E402
+
+EMAIL_PATTERN = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+
+
+class InfoField(NamedTuple):
+    """How to read one company info field from its dd element"""
+
+    field: str
+    selector: Optional[str] = None  # Element inside the dd, or the dd itself
+    attribute: Optional[str] = None  # Attribute to read instead of the text
+    first_word: bool = False  # Keep only the first word of the text
+
+
+# dt label in "div.tbCol.tbCoInfo dl.tbList" and the field it holds
+COMPANY_INFO_FIELDS = {
+    "산업(업종)": InfoField("industry", "text"),
+    "사원수": InfoField("employees", "span.tahoma"),
+    "설립년도": InfoField("established", "span.tahoma"),
+    "기업형태": InfoField("company_size", first_word=True),
+    "홈페이지": InfoField("homepage", "a.devCoHomepageLink", "href"),
+}
+
+
+# parse_posting for a page open in the browser, run by read_posting. Only
+# the small result crosses back, so no HTML is parsed in Python.
+POSTING_SCRIPT = """
+(fields) => {
+  const text = (element) => (element.textContent || "").trim();
+  const email = document.querySelector("span.tahoma a.devChargeEmail");
+  const position = document.querySelector("article.artReadJobSum h3.hd_3");
+  const companyInfo = {};
+  for (const info of fields) companyInfo[info.field] = "";
+
+  const infoList = document.querySelector("div.tbCol.tbCoInfo dl.tbList");
+  if (infoList) {
+    const dts = infoList.querySelectorAll("dt");
+    const dds = infoList.querySelectorAll("dd");
+    for (let i = 0; i < Math.min(dts.length, dds.length); i++) {
+      const label = text(dts[i]);
+      const info = fields.find((info) => label.includes(info.label));
+      if (!info) continue;
+      const element = info.selector ? dds[i].querySelector(info.selector) : dds[i];
+      if (!element) continue;
+      let value = info.attribute
+        ? (element.getAttribute(info.attribute) || "").trim()
+        : text(element);
+      if (info.first_word && !info.attribute) value = value.split(/\\s+/)[0];
+      companyInfo[info.field] = value;
+    }
+  }
+
+  return {
+    email_text: email ? email.textContent : null,
+    position_name: position ? text(position).split("\\n").pop().trim() : "",
+    company_info: companyInfo,
+  };
+}
+"""
+
+# parse_listings for a page open in the browser, run by read_listings
+LISTINGS_SCRIPT = """
+() => {
+  const container = document.querySelector("article.list");
+  if (!container) return null;
+  const listings = [];
+  for (const item of container.querySelectorAll("article.list-item")) {
+    const name = item.querySelector("div.list-section-corp a");
+    const link = item.querySelector("div.information-title a");
+    if (name && link && link.getAttribute("href")) {
+      listings.push([name.textContent.trim(), link.getAttribute("href")]);
+    }
+  }
+  return listings;
+}
+"""
+
+
+def extract_email(text: str) -> Optional[str]:
+    """Extract email from text using regex"""
+    match = EMAIL_PATTERN.search(text)
+    return match.group(0).strip() if match else None
+
+
+def is_security_page(html: str) -> bool:
+    """Check whether the page is the security policy block page.
+
+    Pages without the block message are ruled out by a substring check, so
+    only a likely block page is parsed.
+    """
+    if "reasonExp" not in html or "보안정책" not in html:
+        return False
+    document = parse_html(html)
+    return any("보안정책" in p.text() for p in document.select("p.reasonExp"))
+
+
+def parse_posting(html: str) -> Dict[str, object]:
+    """Extract everything collected from a job posting page in one pass.
+
+    Returns a dict with "email_text" (None if there is no email element),
+    "email", "position_name" and "company_info" holding every
+    COMPANY_INFO_FIELDS field.
+    """
+    document = parse_html(html)
+
+    email_element = document.select_one("span.tahoma a.devChargeEmail")
+    email_text = email_element.text() if email_element else None
+
+    # 1. 직종명
+    position_name = ""
+    position_element = document.select_one("article.artReadJobSum h3.hd_3")
+    if position_element:
+        position_name = position_element.text().strip().split("\n")[-1].strip()
+
+    # Company info from tbList
+    company_info = {info.field: "" for info in COMPANY_INFO_FIELDS.values()}
+    info_list = document.select_one("div.tbCol.tbCoInfo dl.tbList")
+    if info_list:
+        dts = [node for node in info_list.descendants() if node.tag == "dt"]
+        dds = [node for node in info_list.descendants() if node.tag == "dd"]
+        for dt, dd in zip(dts, dds):
+            label = dt.text().strip()
+            info = next(
+                (info for key, info in COMPANY_INFO_FIELDS.items() if key in label),
+                None,
+            )
+            if info is None:
+                continue
+
+            element = dd.select_one(info.selector) if info.selector else dd
+            if element is None:
+                continue
+            if info.attribute:
+                value = (element.get(info.attribute) or "").strip()
+            else:
+                value = element.text().strip()
+                if info.first_word:
+                    value = value.split()[0] if value else ""
+            company_info[info.field] = value
+
+    return {
+        "email_text": email_text,
+        "email": extract_email(email_text) if email_text else None,
+        "position_name": position_name,
+        "company_info": company_info,
+    }
+
+
+def read_posting(page) -> Dict[str, object]:
+    """parse_posting for the posting open in a Playwright page.
+
+    The extraction runs in the browser with one page.evaluate, which is
+    much cheaper than parsing the page's HTML in Python.
+    """
+    fields = [
+        {"label": label, **info._asdict()}
+        for label, info in COMPANY_INFO_FIELDS.items()
+    ]
+    posting = page.evaluate(POSTING_SCRIPT, fields)
+    email_text = posting["email_text"]
+    return {
+        "email_text": email_text,
+        "email": extract_email(email_text) if email_text else None,
+        "position_name": posting["position_name"],
+        "company_info": posting["company_info"],
+    }
+
+
+def parse_listings(html: str) -> Optional[List[Tuple[str, str]]]:
+    """Read every (company, posting link) of a search result page at once.
+
+    Returns None when the page has no result list. Items without a company
+    or a posting link are left out.
+    """
+    container = parse_html(html).select_one("article.list")
+    if container is None:
+        return None
+
+    listings = []
+    for item in container.select("article.list-item"):
+        name = item.select_one("div.list-section-corp a")
+        link = item.select_one("div.information-title a")
+        if name is not None and link is not None and link.get("href"):
+            listings.append((name.text().strip(), link.get("href")))
+    return listings
+
+
+def read_listings(page) -> Optional[List[Tuple[str, str]]]:
+    """parse_listings for the search page open in a Playwright page"""
+    listings = page.evaluate(LISTINGS_SCRIPT)
+    if listings is None:
+        return None
+    return [(name, link) for name, link in listings]
+
+
+if __name__ == "__main__":
+    # Check the extraction offline against saved posting pages
+    for filename in sys.argv[1:]:
+        print(filename, parse_posting(Path(filename).read_text(encoding="utf-8")))
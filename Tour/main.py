@@ -1,220 +1,950 @@
+import argparse
 import csv
+import json
+import os
+import queue
 import re
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
 
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 from playwright.sync_api import sync_playwright
 
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.archive import PageArchive  # noqa: E402
+from common.browser_daemon import open_browser  # noqa: E402
+from common.contacts import ContactStage, open_seen_store  # noqa: E402
+from common.dom import Node, parse_html  # noqa: E402
+from common.governor import PageRecycler, ResourceGovernor  # noqa: E402
+from common.metrics import Metrics  # noqa: E402
+from common.network import LEAN_LAUNCH_OPTIONS, RequestBlocker  # noqa: E402
+from common.retry import (  # noqa: E402
+    MissingElementError,
+    RetryQueue,
+    load_dead_letters,
+)
+from common.sharding import (  # noqa: E402
+    merge_csv_files,
+    run_processes,
+    shard_of,
+    shard_path,
+)
+from snapshot import MemberSnapshot, member_id  # noqa: E402
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:  # The HTTP engine is optional
+    requests = None
+
 base_url = "https://www.kata.or.kr/v2/03_member/sub0301_memberSearch.asp"
 detail_url = "https://www.kata.or.kr/v2/03_member/sub0301_memberSearchPopup.asp"
 
+# Browser launch options and request blocking shared by every worker
+browser_options = dict(LEAN_LAUNCH_OPTIONS)
+request_blocker = RequestBlocker()
 
-def extract_data_from_page(page):
-    data = []
+# Control URL of a browser daemon to attach to instead of launching browsers
+browser_daemon_url = None
+
+# Replaces each worker's browser context after enough pages or too much memory
+governor = ResourceGovernor()
+
+# Stage timings and event counts for the run
+metrics = Metrics("kata")
+
+# Members whose page failed, retried after the main pass
+retry_queue = RetryQueue(
+    f"kata_failed_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+)
+
+# Archive of fetched member pages, set with --record
+page_archive = None
+
+# Normalizes member contacts and drops members whose contact was already saved
+contact_stage = ContactStage(
+    company="company", email="email", phone="tel", url="website"
+)
+
+# Number of browsers visiting member detail pages at the same time
+CONCURRENCY = 4
+
+# Matches the quoted codes in a list row's onclick, e.g. goView('123','456')
+MEMBER_CODE_PATTERN = re.compile(r"'(\d+)'")
+
+# Matches the page numbers linked from the list pager, e.g. pageSend(52)
+PAGE_SEND_PATTERN = re.compile(r"pageSend\((\d+)\)")
 
+# Member detail fields and the label of the table cell holding each of them
+MEMBER_FIELDS = {
+    "company": "회원사명",
+    "representative": "대표자",
+    "address": "주소",
+    "tel": "전화",
+    "email": "전자우편",
+    "website": "누리집",
+}
+
+
+def with_page_retry(page, action, retries=1, delay=2):
+    """Run action(page), reloading the page and trying again if it fails"""
+    for attempt in range(retries + 1):
+        try:
+            return action(page)
+        except Exception as e:
+            if attempt == retries:
+                raise
+            print(f"Error processing page: {e}")
+            metrics.count("retries")
+            # If there's an error, wait and try one more time
+            time.sleep(delay)
+            page.reload()
+
+
+def harvest_member_codes(page):
     # Wait for the table and tbody to be present
     page.wait_for_selector("table tbody", state="attached")
     page.wait_for_load_state("networkidle")
 
-    tbody = page.locator("tbody")
-    trs = tbody.locator("tr")
+    # Read every row's onclick handler in a single call
+    onclicks = page.eval_on_selector_all(
+        "tbody tr", "rows => rows.map(row => row.getAttribute('onclick'))"
+    )
 
-    try:
-        count = trs.count()
-
-        for i in range(count):
-            tr = trs.nth(i)
-            onclick = tr.get_attribute("onclick")
-            if onclick:
-                numbers = re.findall(r"'(\d+)'", onclick)
-                if len(numbers) == 2:
-                    data.append({"businesscode": numbers[0], "custcode": numbers[1]})
-    except Exception as e:
-        print(f"Error processing page: {e}")
-        # If there's an error, wait and try one more time
-        time.sleep(2)
-        page.reload()
-        page.wait_for_selector("table tbody", state="attached")
-        page.wait_for_load_state("networkidle")
-
-        # Try again
-        tbody = page.locator("tbody")
-        trs = tbody.locator("tr")
-        count = trs.count()
+    data = []
+    for onclick in onclicks:
+        if onclick:
+            numbers = MEMBER_CODE_PATTERN.findall(onclick)
+            if len(numbers) == 2:
+                data.append({"businesscode": numbers[0], "custcode": numbers[1]})
+    return data
 
-        for i in range(count):
-            tr = trs.nth(i)
-            onclick = tr.get_attribute("onclick")
-            if onclick:
-                numbers = re.findall(r"'(\d+)'", onclick)
-                if len(numbers) == 2:
-                    data.append({"businesscode": numbers[0], "custcode": numbers[1]})
 
-    return data
+def extract_data_from_page(page):
+    return with_page_retry(page, harvest_member_codes)
 
 
-def visit_member_page(page, businesscode, custcode):
-    try:
-        member_url = f"{detail_url}?businesscode={businesscode}&custcode={custcode}"
-        page.goto(member_url)
-        page.wait_for_load_state("networkidle")
+def count_error(e):
+    metrics.count("timeouts" if isinstance(e, PlaywrightTimeoutError) else "errors")
 
-        # Wait for table to be visible
-        page.wait_for_selector("table.talbe_01", state="visible", timeout=5000)
-        time.sleep(0.5)
-
-        # Initialize data dictionary
-        member_data = {
-            "businesscode": businesscode,
-            "custcode": custcode,
-            "company": "",
-            "representative": "",
-            "address": "",
-            "tel": "",
-            "email": "",
-            "website": "",
-        }
 
-        # Process each field with timeout protection
-        try:
-            # Company name
-            if (
-                company := page.locator("td:has-text('회원사명') + td")
-                .first.inner_text(timeout=5000)
-                .strip()
-            ):
-                member_data["company"] = company
+def member_url(businesscode, custcode):
+    return f"{detail_url}?businesscode={businesscode}&custcode={custcode}"
 
-            # Representative
-            if (
-                rep := page.locator("td:has-text('대표자') + td")
-                .first.inner_text(timeout=5000)
-                .strip()
-            ):
-                member_data["representative"] = rep
 
-            # Address
-            if (
-                addr := page.locator("td:has-text('주소') + td")
-                .first.inner_text(timeout=5000)
-                .strip()
-            ):
-                member_data["address"] = addr
+def record_member_page(businesscode, custcode, html):
+    """Store a fetched member page when recording"""
+    if page_archive is not None:
+        page_archive.put(
+            member_url(businesscode, custcode),
+            html,
+            businesscode=businesscode,
+            custcode=custcode,
+        )
 
-            # Phone
-            if (
-                tel := page.locator("td:has-text('전화') + td")
-                .first.inner_text(timeout=5000)
-                .strip()
-            ):
-                member_data["tel"] = tel
 
-            # Email
-            if (
-                email := page.locator("td:has-text('전자우편') + td")
-                .first.inner_text(timeout=5000)
-                .strip()
-            ):
-                member_data["email"] = email
+def visit_member_page(page, businesscode, custcode):
+    try:
+        with metrics.stage("navigation"):
+            page.goto(member_url(businesscode, custcode))
+        with metrics.stage("load_state"):
+            page.wait_for_load_state("networkidle")
 
-            # Website
-            website_cell = page.locator("td:has-text('누리집') + td").first
-            if website := website_cell.inner_text(timeout=5000).strip():
-                member_data["website"] = website
-            else:
-                return None  # Skip if no website
+        # Wait for table to be visible
+        with metrics.stage("selector"):
+            page.wait_for_selector("table.talbe_01", state="visible", timeout=5000)
 
-            print(member_data)
-            return member_data
+        # Read every field from a single snapshot of the page
+        try:
+            html = page.content()
+            record_member_page(businesscode, custcode, html)
+            with metrics.stage("extraction"):
+                fields = parse_member_fields(html)
+            if fields is None:
+                metrics.count("missing_table")
+                raise MissingElementError("No member table found")
+            return build_member_data(businesscode, custcode, fields)
 
         except Exception as e:
             print(f"Error processing member {businesscode}-{custcode}: {str(e)}")
+            count_error(e)
+            retry_queue.add_failure(
+                {"businesscode": businesscode, "custcode": custcode}, e
+            )
             return None
 
     except Exception as e:
         print(f"Error visiting member page {businesscode}-{custcode}: {str(e)}")
+        count_error(e)
+        retry_queue.add_failure({"businesscode": businesscode, "custcode": custcode}, e)
         return None
 
 
-def save_to_csv(member_details):
-    if not member_details:
-        print("No data to save")
-        return
+def run_page_workers(tasks, handler, concurrency=CONCURRENCY):
+    """Run handler(page, task) for every task on `concurrency` worker browsers.
 
-    # Generate filename with current timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"kata_members_{timestamp}.csv"
-
-    # Write to CSV
-    with open(filename, "w", newline="", encoding="utf-8-sig") as f:
-        fieldnames = [
-            "businesscode",
-            "custcode",
-            "company",
-            "representative",
-            "address",
-            "tel",
-            "email",
-            "website",
+    Each worker thread owns its own Playwright instance and page (the sync API
+    is bound to the thread that started it) and pulls tasks from a shared
+    queue. Results are yielded as (task, result) in the original task order,
+    regardless of which worker finished first.
+    """
+    tasks = list(tasks)
+    pending = queue.Queue()
+    for index, task in enumerate(tasks):
+        pending.put((index, task))
+
+    done = object()
+    results = queue.Queue()
+
+    def worker():
+        try:
+            with sync_playwright() as p:
+                browser = open_browser(p, browser_options, browser_daemon_url)
+                pages = PageRecycler(browser, governor, request_blocker.install)
+                try:
+                    while True:
+                        try:
+                            index, task = pending.get_nowait()
+                        except queue.Empty:
+                            break
+                        try:
+                            result = handler(pages.page, task)
+                        except Exception as e:
+                            print(f"Error in worker for task {task}: {str(e)}")
+                            count_error(e)
+                            result = None
+                        results.put((index, result))
+                        pages.navigated()
+                finally:
+                    browser.close()
+        except Exception as e:
+            print(f"Worker stopped: {str(e)}")
+        finally:
+            results.put(done)
+
+    workers = [
+        threading.Thread(target=worker, daemon=True)
+        for _ in range(max(1, min(concurrency, len(tasks))))
+    ]
+    for thread in workers:
+        thread.start()
+
+    # Buffer out-of-order completions and release them in task order
+    finished = {}
+    next_index = 0
+    running = len(workers)
+    while next_index < len(tasks) and running:
+        item = results.get()
+        if item is done:
+            running -= 1
+            continue
+        index, result = item
+        finished[index] = result
+        while next_index in finished:
+            yield tasks[next_index], finished.pop(next_index)
+            next_index += 1
+
+    if next_index < len(tasks):
+        print(f"All workers stopped, {len(tasks) - next_index} tasks left unprocessed")
+
+    for thread in workers:
+        thread.join()
+
+
+def parse_member_fields(html):
+    """Map MEMBER_FIELDS to the cell following each label in the member table.
+
+    Returns None when the table is missing, and leaves out fields whose label
+    is not on the page, so callers can tell an incomplete page from an empty
+    value.
+    """
+    table = parse_html(html).select_one("table.talbe_01")
+    if table is None:
+        return None
+
+    # Text of every cell, row by row
+    rows = [
+        [
+            " ".join(cell.text().split())
+            for cell in tr.children
+            if isinstance(cell, Node) and cell.tag == "td"
         ]
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(member_details)
+        for tr in table.select("tr")
+    ]
+
+    fields = {}
+    for field, label in MEMBER_FIELDS.items():
+        for row in rows:
+            matches = [i for i, cell in enumerate(row[:-1]) if label in cell]
+            if matches:
+                fields[field] = row[matches[0] + 1]
+                break
+    return fields
+
+
+def create_http_session(pool_size=CONCURRENCY):
+    """Create a keep-alive HTTP session for fetching member popups"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(
+        {
+            "User-Agent": (
+                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+            ),
+            "Referer": base_url,
+        }
+    )
+    return session
 
-    print(f"\nData saved to {filename}")
 
+def fetch_member_fields(session, businesscode, custcode):
+    """Fetch a member popup over HTTP. Returns None if the browser is needed."""
+    try:
+        with metrics.stage("http_fetch"):
+            response = session.get(
+                detail_url,
+                params={"businesscode": businesscode, "custcode": custcode},
+                timeout=10,
+            )
+            response.raise_for_status()
+            if response.encoding is None or response.encoding.lower() == "iso-8859-1":
+                response.encoding = response.apparent_encoding
+
+        with metrics.stage("extraction"):
+            fields = parse_member_fields(response.text)
+        if fields is None or len(fields) < len(MEMBER_FIELDS):
+            # Table is rendered by script or fields are missing
+            metrics.count("http_fallbacks")
+            return None
+        record_member_page(businesscode, custcode, response.text)
+        return fields
+    except Exception as e:
+        print(f"HTTP fetch failed for member {businesscode}-{custcode}: {str(e)}")
+        metrics.count("http_errors")
+        return None
 
-def main():
-    all_members = []
-    member_details = []
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        page = browser.new_page()
+def build_member_data(businesscode, custcode, fields):
+    """Build a member row from extracted fields (members without a website
+    are built too, and left out by save_member)"""
+    member_data = {"businesscode": businesscode, "custcode": custcode}
+    for field in MEMBER_FIELDS:
+        member_data[field] = fields.get(field, "")
 
-        try:
-            page.goto(base_url)
-            page.wait_for_load_state("networkidle")
+    print(member_data)
+    return member_data
 
-            total_pages = 52
 
-            # First collect all member codes
-            for page_num in range(1, total_pages + 1):
-                print(f"Processing page {page_num}/{total_pages}")
+def visit_members(members, engine="browser", concurrency=CONCURRENCY):
+    """Visit member detail pages, yielding (member, member_detail) pairs.
 
-                page_data = extract_data_from_page(page)
-                all_members.extend(page_data)
+    The "http" engine fetches popups without a browser and only hands members
+    whose page could not be parsed to the browser workers afterwards.
+    """
 
-                if page_num < total_pages:
-                    page.evaluate(f"pageSend({page_num + 1})")
-                    page.wait_for_load_state("networkidle")
-                    time.sleep(1)
+    def visit(page, member):
+        return visit_member_page(page, member["businesscode"], member["custcode"])
 
-            print(f"\nTotal members found: {len(all_members)}")
+    if engine != "http":
+        yield from run_page_workers(members, visit, concurrency)
+        return
+
+    if requests is None:
+        print("requests is not installed, falling back to the browser engine")
+        yield from run_page_workers(members, visit, concurrency)
+        return
 
-            # Process members with progress tracking
-            total_members = len(all_members)
-            for i, member in enumerate(all_members, 1):
-                print(f"\nProcessing member {i}/{total_members}")
-                member_detail = visit_member_page(
-                    page, member["businesscode"], member["custcode"]
+    fallback = []
+    session = create_http_session(concurrency)
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            fetched = executor.map(
+                lambda member: fetch_member_fields(
+                    session, member["businesscode"], member["custcode"]
+                ),
+                members,
+            )
+            for member, fields in zip(members, fetched):
+                if fields is None:
+                    fallback.append(member)
+                    continue
+                yield member, build_member_data(
+                    member["businesscode"], member["custcode"], fields
                 )
-                if member_detail:
-                    member_details.append(member_detail)
+    finally:
+        session.close()
 
-                # Save progress every 50 members
-                if i % 50 == 0:
-                    save_to_csv(member_details)
+    if fallback:
+        print(f"\nVisiting {len(fallback)} members with the browser")
+        yield from run_page_workers(fallback, visit, concurrency)
 
-        except Exception as e:
-            print(f"Error in main process: {str(e)}")
-        finally:
-            browser.close()
 
-    # Final save
-    print(f"\nCollected details for {len(member_details)} members")
-    save_to_csv(member_details)
+def default_output():
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"kata_members_{timestamp}.csv"
+
+
+class MemberCsvWriter:
+    """Append member rows to a single CSV file as soon as they are extracted.
+
+    Opening an existing file resumes it: rows already in the file are kept
+    and their (businesscode, custcode) pairs are reported by `written`.
+    Every row is flushed, and the file is fsynced every `fsync_every` rows.
+    """
+
+    fieldnames = ["businesscode", "custcode", *MEMBER_FIELDS]
+
+    def __init__(self, filename=None, fsync_every=50):
+        if filename is None:
+            filename = default_output()
+        self.filename = filename
+        self.fsync_every = fsync_every
+        self.written = set()
+        self.count = 0
+
+        if os.path.exists(filename):
+            with open(filename, "r", newline="", encoding="utf-8-sig") as f:
+                for row in csv.DictReader(f):
+                    self.written.add((row["businesscode"], row["custcode"]))
+            if self.written:
+                print(f"Resuming {filename}: {len(self.written)} members already saved")
+
+        self._file = open(filename, "a", newline="", encoding="utf-8-sig")
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames)
+        if self._file.tell() == 0:
+            self._writer.writeheader()
+            self._file.flush()
+
+    def write(self, member_data):
+        with metrics.stage("output_write"):
+            self._writer.writerow(member_data)
+            self._file.flush()
+            self.written.add((member_data["businesscode"], member_data["custcode"]))
+            self.count += 1
+            if self.count % self.fsync_every == 0:
+                os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_total_pages(page):
+    """Read the highest page number linked from the pager"""
+    numbers = PAGE_SEND_PATTERN.findall(page.content())
+    return max((int(n) for n in numbers), default=1)
+
+
+def visit_list_page(page, page_num):
+    """Open a list page and return its member codes and the last page in its pager"""
+    page.goto(base_url)
+    page.wait_for_load_state("networkidle")
+    if page_num > 1:
+        # pageSend submits the list form; wait for the new document, since
+        # the old one is already idle and would still show page 1
+        with page.expect_navigation():
+            page.evaluate(f"pageSend({page_num})")
+        page.wait_for_load_state("networkidle")
+
+    return extract_data_from_page(page), read_total_pages(page)
+
+
+def timed_visit_list_page(page, page_num):
+    with metrics.stage("list_page"):
+        return visit_list_page(page, page_num)
+
+
+def collect_member_codes(concurrency=CONCURRENCY):
+    """Collect member codes from every list page, in page order and deduplicated.
+
+    Page 1 is read first to find the page count; the remaining pages are then
+    fetched concurrently. If any page links past the known last page (the
+    pager only shows a window), the extra pages are fetched in another round.
+    Returns the members and the numbers of the list pages that failed, in
+    which case the member list is incomplete.
+    """
+    all_members = []
+    failed_pages = []
+    seen = set()
+    visited = set()
+    total_pages = 1
+    pages_to_visit = [1]
+
+    while pages_to_visit:
+        # Failed pages are not tried again, so every round ends
+        visited.update(pages_to_visit)
+        list_pages = run_page_workers(
+            pages_to_visit, timed_visit_list_page, concurrency
+        )
+        for page_num, result in list_pages:
+            if result is None:
+                print(f"Failed to process page {page_num}")
+                failed_pages.append(page_num)
+                continue
+
+            page_data, last_page = result
+            total_pages = max(total_pages, last_page)
+            for member in page_data:
+                key = (member["businesscode"], member["custcode"])
+                if key not in seen:
+                    seen.add(key)
+                    all_members.append(member)
+            print(
+                f"Processed page {page_num}/{total_pages} | "
+                f"Members found: {len(all_members)}"
+            )
+
+        pages_to_visit = [n for n in range(1, total_pages + 1) if n not in visited]
+
+    return all_members, failed_pages
+
+
+def member_key(member):
+    return f"{member['businesscode']}-{member['custcode']}"
+
+
+def shard_members(members, shard_index, shard_count):
+    """Members belonging to one shard; the split is stable across machines"""
+    return [
+        member
+        for member in members
+        if shard_of(member_key(member), shard_count) == shard_index
+    ]
+
+
+def save_member(writer, member, member_detail, on_detail=None):
+    """Normalize a member detail and write it unless it has no website or its
+    contact is a duplicate. on_detail sees every visited member either way,
+    always in normalized form so snapshots compare like with like."""
+    contact = contact_stage.normalize(member_detail)
+    if not contact["website"]:
+        metrics.count("skipped")  # Skip if no website
+    elif not contact_stage.is_new(contact):
+        print(f"Skipping duplicate contact for {contact['company']}")
+        metrics.count("duplicates")
+    else:
+        writer.write(contact)
+    if on_detail:
+        on_detail(member, contact)
+
+
+def crawl_members(
+    members, writer, engine="browser", concurrency=CONCURRENCY, on_detail=None
+):
+    """Visit the members not yet saved by writer and write their details.
+
+    on_detail(member, member_detail) is called for every member whose page
+    was read, including members without a website.
+    """
+    # Skip members already saved by a previous run into the same file
+    total_found = len(members)
+    members = [
+        member
+        for member in members
+        if (member["businesscode"], member["custcode"]) not in writer.written
+    ]
+    if total_found > len(members):
+        metrics.count("resumed", total_found - len(members))
+
+    # Then visit the member pages with a pool of workers
+    total_members = len(members)
+    member_pages = visit_members(members, engine, concurrency)
+    try:
+        for i, (member, member_detail) in enumerate(member_pages, 1):
+            print(f"\nProcessed member {i}/{total_members}")
+            if member_detail:
+                save_member(writer, member, member_detail, on_detail)
+
+        # Try failed members again with backoff until they succeed or give up
+        while retry_members := retry_queue.next_round():
+            metrics.count("retries", len(retry_members))
+            for member, member_detail in visit_members(
+                retry_members, "browser", concurrency
+            ):
+                if member_detail:
+                    save_member(writer, member, member_detail, on_detail)
+    except Exception as e:
+        print(f"Error in main process: {str(e)}")
+
+    print(f"\nCollected details for {writer.count} members")
+    print(f"Data saved to {writer.filename}")
+    print(contact_stage.summary())
+    print(retry_queue.summary())
+
+
+def shard_settings(archive_dir):
+    """Settings a shard process needs to crawl like this one"""
+    return {
+        "browser_options": browser_options,
+        "browser_daemon_url": browser_daemon_url,
+        "archive_dir": archive_dir,
+        "max_navigations": governor.max_navigations,
+        "max_rss_mb": governor.max_rss_mb,
+    }
+
+
+def run_shard(members, shard_index, shard_count, output, engine, concurrency, settings):
+    """Crawl one shard of members in this process (the target of --shards)"""
+    global page_archive, browser_daemon_url
+    browser_options.update(settings["browser_options"])
+    browser_daemon_url = settings["browser_daemon_url"]
+    if settings["archive_dir"]:
+        page_archive = PageArchive(settings["archive_dir"])
+    governor.max_navigations = settings["max_navigations"]
+    governor.max_rss_mb = settings["max_rss_mb"]
+    retry_queue.dead_letter_path = shard_path(retry_queue.dead_letter_path, shard_index)
+    print(f"Shard {shard_index}/{shard_count}: starting")
+    with MemberCsvWriter(output) as writer:
+        crawl_members(
+            shard_members(members, shard_index, shard_count),
+            writer,
+            engine,
+            concurrency,
+        )
+    print(request_blocker.summary())
+    print(governor.summary())
+    print(metrics.summary())
+
+
+def merge_shards(paths, output, members=None):
+    """Merge shard files into output, in list order when the members are known.
+
+    Shards only drop duplicate contacts among their own members, so the
+    merged rows go through a fresh contact stage as well.
+    """
+    position = {member_key(member): i for i, member in enumerate(members or [])}
+    stage = ContactStage(**contact_stage.columns)
+
+    def sort_key(row):
+        if position:
+            return position.get(member_key(row), len(position))
+        return int(row["businesscode"]), int(row["custcode"])
+
+    count = merge_csv_files(
+        paths,
+        output,
+        ["businesscode", "custcode"],
+        sort_key=sort_key,
+        encoding="utf-8-sig",
+        row_filter=stage.process,
+    )
+    print(f"\nMerged {count} members into {output}")
+    print(stage.summary())
+
+
+def crawl_incremental(
+    members,
+    writer,
+    snapshot_file,
+    sample_size,
+    engine,
+    concurrency,
+    list_complete=True,
+):
+    """Visit only new members and a rotating sample of known ones.
+
+    The snapshot is updated with what was found, and the added, changed and
+    removed members are written to a kata_diff_*.json file. Members whose
+    page could not be read are marked to be tried again in the next run.
+    Unless list_complete, members missing from the list are kept, since
+    they may only be on a list page that failed.
+    """
+    snapshot = MemberSnapshot(snapshot_file)
+    new, sampled, removed = snapshot.plan(members, sample_size)
+    print(
+        f"Incremental crawl: {len(new)} new, {len(sampled)} sampled, "
+        f"{len(removed)} removed members"
+    )
+
+    visited = set()
+
+    def on_detail(member, member_detail):
+        visited.add(member_id(member))
+        snapshot.update(member, member_detail)
+
+    crawl_members(new + sampled, writer, engine, concurrency, on_detail)
+    for member in new + sampled:
+        if member_id(member) not in visited:
+            snapshot.mark_failed(member)
+    if list_complete:
+        snapshot.remove(removed)
+    else:
+        print(
+            f"Some list pages failed, keeping {len(removed)} members "
+            "missing from the list"
+        )
+    snapshot.save()
+
+    diff = snapshot.diff()
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    diff_filename = f"kata_diff_{timestamp}.json"
+    with open(diff_filename, "w", encoding="utf-8") as f:
+        json.dump(diff, f, ensure_ascii=False, indent=2)
+    print(
+        f"Added: {len(diff['added'])} | changed: {len(diff['changed'])} | "
+        f"removed: {len(diff['removed'])} (saved to {diff_filename})"
+    )
+
+
+def reextract_archive(archive_dir, writer):
+    """Run the member extraction over an archive recorded with --record.
+
+    Nothing is fetched, so a changed label or a new field can be checked
+    against every recorded page at parse speed.
+    """
+    archive = PageArchive(archive_dir)
+    print(f"Re-extracting {len(archive)} archived pages from {archive_dir}")
+    for entry in archive.entries():
+        if "businesscode" not in entry:
+            continue
+        with metrics.stage("extraction"):
+            fields = parse_member_fields(archive.read(entry))
+        if fields is None:
+            metrics.count("missing_table")
+            print(f"No member table in archived page {entry['url']}")
+            continue
+        member_data = build_member_data(
+            entry["businesscode"], entry["custcode"], fields
+        )
+        if member_data:
+            save_member(writer, entry, member_data)
+
+    print(f"\nCollected details for {writer.count} members")
+    print(f"Data saved to {writer.filename}")
+    print(contact_stage.summary())
+
+
+def main(
+    concurrency=CONCURRENCY,
+    engine="browser",
+    output=None,
+    metrics_file=None,
+    prometheus_file=None,
+    shards=1,
+    shard_index=None,
+    replay_file=None,
+    snapshot_file=None,
+    sample_size=50,
+    archive_dir=None,
+):
+    """Crawl the directory here, split over `shards` local processes.
+
+    With shard_index, only that shard of `shards` is crawled, for spreading
+    a crawl over several machines; merge their files with --merge. With
+    replay_file, only the members in that dead-letter file are visited.
+    With snapshot_file, only new members and `sample_size` known ones are.
+    With archive_dir, every fetched member page is recorded there.
+    """
+    global page_archive
+    metrics.events_path = metrics_file
+    if archive_dir:
+        page_archive = PageArchive(archive_dir)
+
+    failed_pages = []
+    if replay_file:
+        all_members = load_dead_letters(replay_file)
+        print(f"Replaying {len(all_members)} failed members from {replay_file}")
+    else:
+        # First collect all member codes
+        all_members, failed_pages = collect_member_codes(concurrency)
+        print(f"\nTotal members found: {len(all_members)}")
+
+    if shards > 1 and shard_index is None:
+        output = output or default_output()
+        paths = [shard_path(output, i) for i in range(shards)]
+        run_processes(
+            run_shard,
+            [
+                (
+                    all_members,
+                    i,
+                    shards,
+                    path,
+                    engine,
+                    concurrency,
+                    shard_settings(archive_dir),
+                )
+                for i, path in enumerate(paths)
+            ],
+        )
+        merge_shards(paths, output, all_members)
+    else:
+        if shard_index is not None:
+            all_members = shard_members(all_members, shard_index, shards)
+            print(f"Shard {shard_index}/{shards}: {len(all_members)} members")
+            output = output or shard_path(default_output(), shard_index)
+
+        with MemberCsvWriter(output) as writer:
+            if snapshot_file:
+                crawl_incremental(
+                    all_members,
+                    writer,
+                    snapshot_file,
+                    sample_size,
+                    engine,
+                    concurrency,
+                    list_complete=not failed_pages,
+                )
+            else:
+                crawl_members(all_members, writer, engine, concurrency)
+        contact_stage.save()
+        print(request_blocker.summary())
+        print(governor.summary())
+
+    print(metrics.summary())
+    if prometheus_file:
+        metrics.write_prometheus(prometheus_file)
+    metrics.close()
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Collect KATA member details")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=CONCURRENCY,
+        help=f"number of browsers visiting list and member pages (default {CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["browser", "http"],
+        default="browser",
+        help="fetch member pages with the browser or over plain HTTP",
+    )
+    parser.add_argument(
+        "--output",
+        help="CSV file to write to; an existing file is resumed",
+    )
+    parser.add_argument(
+        "--headed",
+        action="store_true",
+        help="show the browser windows instead of running headless",
+    )
+    parser.add_argument(
+        "--metrics",
+        help="append stage timings and event counts to this JSON lines file",
+    )
+    parser.add_argument(
+        "--prometheus",
+        help="write the end-of-run metrics to this file in Prometheus text format",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=1,
+        help="split the members into this many shards, one process each",
+    )
+    parser.add_argument(
+        "--shard-index",
+        type=int,
+        help="only crawl this shard of --shards (to spread a crawl over machines)",
+    )
+    parser.add_argument(
+        "--merge",
+        nargs="+",
+        metavar="SHARD_FILE",
+        help="merge shard output files into --output and exit",
+    )
+    parser.add_argument(
+        "--replay-failures",
+        metavar="DEAD_LETTER_FILE",
+        help="only visit the members in a kata_failed_*.jsonl file",
+    )
+    parser.add_argument(
+        "--incremental",
+        metavar="SNAPSHOT_FILE",
+        help="only visit members not in this snapshot plus a rotating sample",
+    )
+    parser.add_argument(
+        "--sample",
+        type=int,
+        default=50,
+        help="known members re-checked per incremental run (default 50)",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="ARCHIVE_DIR",
+        help="store every fetched member page in this archive",
+    )
+    parser.add_argument(
+        "--reextract",
+        metavar="ARCHIVE_DIR",
+        help="extract members from a --record archive into --output and exit",
+    )
+    parser.add_argument(
+        "--recycle-after",
+        type=int,
+        default=governor.max_navigations,
+        help="pages a browser context visits before it is replaced "
+        f"(default {governor.max_navigations}, 0 for never)",
+    )
+    parser.add_argument(
+        "--max-rss",
+        type=float,
+        metavar="MIB",
+        help="also replace contexts once the crawl and its browsers use this much memory",
+    )
+    parser.add_argument(
+        "--seen",
+        metavar="SEEN_FILE",
+        help="also skip contacts saved by earlier runs, and add this run's to the file",
+    )
+    parser.add_argument(
+        "--seen-capacity",
+        type=int,
+        help="keep --seen as a fixed-size Bloom filter sized for this many contacts",
+    )
+    parser.add_argument(
+        "--browser-daemon",
+        metavar="URL",
+        help="attach to browsers from this common.browser_daemon instead of "
+        "launching them (default: $BROWSER_DAEMON_URL)",
+    )
+    args = parser.parse_args()
+    if args.incremental and (args.shards > 1 or args.replay_failures):
+        parser.error(
+            "--incremental cannot be combined with --shards or --replay-failures"
+        )
+    if args.seen and args.shards > 1 and args.shard_index is None:
+        parser.error("--seen cannot be combined with local --shards")
+    contact_stage.seen = open_seen_store(args.seen, args.seen_capacity)
+    browser_daemon_url = args.browser_daemon
+    governor.max_navigations = args.recycle_after
+    governor.max_rss_mb = args.max_rss
+    if args.headed:
+        browser_options["headless"] = False
+    if args.merge:
+        merge_shards(args.merge, args.output or default_output())
+    elif args.reextract:
+        with MemberCsvWriter(args.output) as writer:
+            reextract_archive(args.reextract, writer)
+        contact_stage.save()
+        print(metrics.summary())
+    else:
+        main(
+            concurrency=args.concurrency,
+            engine=args.engine,
+            output=args.output,
+            metrics_file=args.metrics,
+            prometheus_file=args.prometheus,
+            shards=args.shards,
+            shard_index=args.shard_index,
+            replay_file=args.replay_failures,
+            snapshot_file=args.incremental,
+            sample_size=args.sample,
+            archive_dir=args.record,
+        )
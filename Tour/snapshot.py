@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+import time
+
+
+def member_id(member):
+    return f"{member['businesscode']}-{member['custcode']}"
+
+
+def record_hash(record):
+    """Content hash of a member record, ignoring key order"""
+    data = json.dumps(record, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+class MemberSnapshot:
+    """Members seen in earlier runs, for crawling only what changed.
+
+    The snapshot file maps each "businesscode-custcode" to the last record
+    extracted for it and that record's hash. `plan` splits the current member
+    list into new members, a rotating sample of known members to re-check,
+    and members that disappeared; `update`, `mark_failed` and `remove` then
+    record what was found, building the diff returned by `diff`.
+
+    A member whose page could not be read is kept with a "failed" flag (and
+    its last record, if any), and is re-checked first in the next run
+    without being reported as new again.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.members = {}
+        self.rotation = 0
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.members = data.get("members", {})
+            self.rotation = data.get("rotation", 0)
+        self.added = []
+        self.changed = []
+        self.removed = []
+
+    def plan(self, members, sample_size):
+        """Return (new members, sampled known members, removed member ids)"""
+        current = {member_id(member): member for member in members}
+        new = [member for key, member in current.items() if key not in self.members]
+        failed = [
+            member
+            for key, member in current.items()
+            if self.members.get(key, {}).get("failed")
+        ]
+        known = sorted(
+            key
+            for key in current
+            if key in self.members and not self.members[key].get("failed")
+        )
+        removed = sorted(key for key in self.members if key not in current)
+
+        # Retry failed members, then take the next slice of known members,
+        # wrapping around the list
+        sampled = failed
+        if known and sample_size > 0:
+            start = self.rotation % len(known)
+            count = min(sample_size, len(known))
+            sampled += [current[known[(start + i) % len(known)]] for i in range(count)]
+            self.rotation = (start + count) % len(known)
+        return new, sampled, removed
+
+    def update(self, member, record):
+        """Store the record found for a member and note whether it is new or changed"""
+        key = member_id(member)
+        digest = record_hash(record)
+        previous = self.members.get(key)
+        if previous is None or "record" not in previous:
+            self.added.append(record)
+        elif previous["hash"] != digest:
+            self.changed.append({"before": previous["record"], "after": record})
+        self.members[key] = {"hash": digest, "record": record, "seen_at": time.time()}
+
+    def mark_failed(self, member):
+        """Note that a member's page could not be read, keeping its last record"""
+        entry = self.members.setdefault(member_id(member), {})
+        entry["failed"] = True
+        entry["seen_at"] = time.time()
+
+    def remove(self, keys):
+        for key in keys:
+            previous = self.members.pop(key, None)
+            if previous is not None and "record" in previous:
+                self.removed.append(previous["record"])
+
+    def diff(self):
+        return {"added": self.added, "changed": self.changed, "removed": self.removed}
+
+    def save(self):
+        """Write the snapshot atomically so a crash never leaves half a file"""
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"members": self.members, "rotation": self.rotation},
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(temp_path, self.path)
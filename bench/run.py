@@ -0,0 +1,260 @@
+"""Offline throughput benchmark for the KATA and JobKorea scrapers.
+
+Starts the fixture server from bench/server.py, points a scraper at it and
+reports pages per second, per-stage latency percentiles and peak RSS:
+
+    python bench/run.py tour --concurrency 4 --engine http --latency-ms 50
+    python bench/run.py jobkorea --concurrency 4 --challenge-rate 0.01
+    python bench/run.py all
+
+Each target runs in its own process so peak RSS is measured separately.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from server import (
+    JOBKOREA_SEARCH_PATH,
+    KATA_LIST_PATH,
+    KATA_POPUP_PATH,
+    FixtureConfig,
+    FixtureServer,
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+from common.governor import process_tree_rss_mb  # noqa: E402
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of values, q in [0, 100]"""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+class StageTimer:
+    """Record how long each call to a wrapped function takes, per stage"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def wrap(self, stage, func):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    self.samples[stage].append(elapsed)
+
+        return timed
+
+    def report(self):
+        return {
+            stage: {
+                "count": len(values),
+                "p50_ms": percentile(values, 50) * 1000,
+                "p95_ms": percentile(values, 95) * 1000,
+                "p99_ms": percentile(values, 99) * 1000,
+            }
+            for stage, values in self.samples.items()
+            if values
+        }
+
+
+class TreeRssSampler:
+    """Track the peak RSS of this process and its browsers while it runs.
+
+    Samples common.governor.process_tree_rss_mb() in a background thread,
+    so browsers that are still running are counted too. peak_mib stays
+    None when RSS cannot be measured on this platform.
+    """
+
+    def __init__(self, interval=0.2):
+        self.interval = interval
+        self.peak_mib = None
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self):
+        rss = process_tree_rss_mb()
+        if rss is not None:
+            self.peak_mib = max(self.peak_mib or 0.0, rss)
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self._sample()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stopped.set()
+        self._thread.join()
+        self._sample()
+
+
+def load_module(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def bench_tour(server_url, args, timer, workdir):
+    sys.path.insert(0, str(ROOT / "Tour"))
+    tour = load_module("tour_main", ROOT / "Tour" / "main.py")
+    tour.base_url = server_url + KATA_LIST_PATH
+    tour.detail_url = server_url + KATA_POPUP_PATH
+    tour.visit_list_page = timer.wrap("list_page", tour.visit_list_page)
+    tour.visit_member_page = timer.wrap("member_page", tour.visit_member_page)
+    tour.fetch_member_fields = timer.wrap("member_http", tour.fetch_member_fields)
+
+    tour.main(
+        concurrency=args.concurrency,
+        engine=args.engine,
+        output=str(workdir / "kata_members.csv"),
+    )
+
+
+def bench_jobkorea(server_url, args, timer, workdir):
+    sys.path.insert(0, str(ROOT / "Jobkorea"))
+    from cold_mail_collector import JobScraper
+    from company_cache import CompanyCache
+
+    scraper = JobScraper()
+    scraper.base_url = server_url
+    scraper.search_url = server_url + JOBKOREA_SEARCH_PATH + "?stext=bench&Page_No="
+    scraper.session_file = str(workdir / "session.json")
+    scraper.company_cache = CompanyCache(str(workdir / "cache.sqlite3"))
+    scraper.rate_limiter.rate = args.rate
+    scraper.rate_limiter.max_rate = args.rate
+    scraper.set_headless(True)
+    # Nobody solves security checks here; the fixture clears them on reload
+    scraper.reload_on_challenge = True
+    scraper.challenge_poll_interval = 0.1
+    scraper.set_concurrency(args.concurrency)
+    scraper.set_search_concurrency(args.concurrency)
+    scraper.set_max_companies(args.max_companies)
+    scraper.set_max_emails(args.max_emails)
+    scraper.fetch_listing = timer.wrap("search_page", scraper.fetch_listing)
+    scraper.collect_email_from_page = timer.wrap(
+        "posting_page", scraper.collect_email_from_page
+    )
+
+    scraper.collect_pipeline()
+
+
+BENCHMARKS = {"tour": bench_tour, "jobkorea": bench_jobkorea}
+
+
+def run_benchmark(target, args):
+    config = FixtureConfig(
+        kata_pages=args.pages,
+        kata_rows=args.rows,
+        jobkorea_pages=args.pages,
+        jobkorea_rows=args.rows,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        challenge_rate=args.challenge_rate,
+    )
+    timer = StageTimer()
+    cwd = os.getcwd()
+    with FixtureServer(config) as server, tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)  # Keep the scrapers' output files out of the tree
+        output = sys.stdout if args.verbose else open(os.devnull, "w")
+        start = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(output), TreeRssSampler() as sampler:
+                BENCHMARKS[target](server.url, args, timer, Path(tmp))
+        finally:
+            elapsed = time.perf_counter() - start
+            os.chdir(cwd)
+            if output is not sys.stdout:
+                output.close()
+
+    stages = timer.report()
+    pages = sum(stage["count"] for stage in stages.values())
+    return {
+        "target": target,
+        "elapsed_s": elapsed,
+        "pages": pages,
+        "pages_per_s": pages / elapsed if elapsed else 0,
+        "stages": stages,
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "peak_tree_rss_mib": sampler.peak_mib,
+    }
+
+
+def print_report(result):
+    print(f"\n== {result['target']} ==")
+    print(
+        f"{result['pages']} pages in {result['elapsed_s']:.2f}s "
+        f"({result['pages_per_s']:.2f} pages/s)"
+    )
+    for stage, stats in result["stages"].items():
+        print(
+            f"  {stage:<14} n={stats['count']:<6} p50={stats['p50_ms']:.1f}ms "
+            f"p95={stats['p95_ms']:.1f}ms p99={stats['p99_ms']:.1f}ms"
+        )
+    tree = result["peak_tree_rss_mib"]
+    print(
+        f"Peak RSS: {result['peak_rss_mib']:.1f} MiB "
+        f"(with browsers: {f'{tree:.1f} MiB' if tree is not None else 'n/a'})"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scrapers offline")
+    parser.add_argument("target", choices=[*BENCHMARKS, "all"])
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--engine", choices=["browser", "http"], default="browser")
+    parser.add_argument("--pages", type=int, default=5, help="listing pages")
+    parser.add_argument("--rows", type=int, default=20, help="rows per page")
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--challenge-rate", type=float, default=0)
+    parser.add_argument(
+        "--rate", type=float, default=50, help="JobKorea requests per second"
+    )
+    parser.add_argument("--max-companies", type=int, default=1000)
+    parser.add_argument("--max-emails", type=int, default=1000)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--verbose", action="store_true", help="show scraper output")
+    args = parser.parse_args()
+
+    if args.target == "all":
+        # Separate processes so each target gets its own peak RSS
+        argv = [arg for arg in sys.argv[1:] if arg != "all"]
+        for target in BENCHMARKS:
+            subprocess.run([sys.executable, __file__, target, *argv], check=True)
+        return
+
+    result = run_benchmark(args.target, args)
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False))
+    else:
+        print_report(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""Local stand-in for the KATA and JobKorea pages used by the scrapers.
+
+Serves synthetic pages with the same structure the scrapers read:
+
+    /v2/03_member/sub0301_memberSearch.asp?page=N       KATA member list
+    /v2/03_member/sub0301_memberSearchPopup.asp?...     KATA member popup
+    /                                                   JobKorea home (logged in)
+    /Search/?...&Page_No=N                              JobKorea search listing
+    /Recruit/GI_Read/<id>                               JobKorea posting
+
+Run it on its own with `python bench/server.py --port 8000`.
+"""
+
+import argparse
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+KATA_LIST_PATH = "/v2/03_member/sub0301_memberSearch.asp"
+KATA_POPUP_PATH = "/v2/03_member/sub0301_memberSearchPopup.asp"
+JOBKOREA_SEARCH_PATH = "/Search/"
+JOBKOREA_POSTING_PATH = "/Recruit/GI_Read/"
+
+
+class FixtureConfig:
+    """Size of the synthetic sites and the faults to inject"""
+
+    def __init__(
+        self,
+        kata_pages: int = 5,
+        kata_rows: int = 10,
+        jobkorea_pages: int = 5,
+        jobkorea_rows: int = 20,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        error_rate: float = 0,
+        challenge_rate: float = 0,
+        seed: Optional[int] = 0,
+    ):
+        self.kata_pages = kata_pages
+        self.kata_rows = kata_rows
+        self.jobkorea_pages = jobkorea_pages
+        self.jobkorea_rows = jobkorea_rows
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.challenge_rate = challenge_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.challenged = set()  # Paths showing a security check until reloaded
+
+    def roll(self, rate: float) -> bool:
+        with self.lock:
+            return self.random.random() < rate
+
+    def challenge(self, path: str) -> bool:
+        """Decide whether path gets a security check. A check clears when the
+        same path is requested again, like a solved check on reload."""
+        with self.lock:
+            if path in self.challenged:
+                self.challenged.discard(path)
+                return False
+            if self.random.random() < self.challenge_rate:
+                self.challenged.add(path)
+                return True
+            return False
+
+    def delay(self) -> float:
+        with self.lock:
+            jitter = self.random.uniform(-self.jitter_ms, self.jitter_ms)
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+
+def page_html(title: str, body: str) -> str:
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8">'
+        f"<title>{title}</title></head><body>{body}</body></html>"
+    )
+
+
+def kata_list_page(config: FixtureConfig, page_no: int) -> str:
+    rows = []
+    for row in range(config.kata_rows):
+        code = (page_no - 1) * config.kata_rows + row + 1
+        rows.append(
+            f"<tr onclick=\"goView('{1000 + code}','{code}')\">"
+            f"<td>{code}</td><td>여행사 {code}</td></tr>"
+        )
+    # The pager only shows a window of pages plus a link to the last one
+    window = range(max(1, page_no - 4), min(config.kata_pages, page_no + 5) + 1)
+    pager = (
+        "".join(f'<a href="javascript:pageSend({n})">{n}</a>' for n in window)
+        + f'<a href="javascript:pageSend({config.kata_pages})">끝</a>'
+    )
+    script = (
+        "<script>function pageSend(n) {"
+        f" location.href = '{KATA_LIST_PATH}?page=' + n; }}</script>"
+    )
+    return page_html(
+        "회원사 검색",
+        f"{script}<table><tbody>{''.join(rows)}</tbody></table>"
+        f'<div class="paging">{pager}</div>',
+    )
+
+
+def kata_popup_page(businesscode: str, custcode: str) -> str:
+    website = f"http://tour{custcode}.example.com" if int(custcode) % 5 else ""
+    cells = [
+        ("회원사명", f"여행사 {custcode}", "대표자", f"대표 {custcode}"),
+        ("주소", f"서울시 중구 {custcode}번길", "전화", f"02-000-{custcode:0>4}"),
+        ("전자우편", f"tour{custcode}@example.com", "누리집", website),
+    ]
+    rows = "".join(
+        f"<tr><td>{a}</td><td>{b}</td><td>{c}</td><td>{d}</td></tr>"
+        for a, b, c, d in cells
+    )
+    return page_html(
+        "회원사 정보",
+        f'<p>{businesscode}</p><table class="talbe_01">{rows}</table>',
+    )
+
+
+def jobkorea_home_page() -> str:
+    return page_html("잡코리아", '<a href="/Login/Logout.asp">로그아웃</a>')
+
+
+def jobkorea_search_page(config: FixtureConfig, page_no: int) -> str:
+    if page_no > config.jobkorea_pages:
+        return page_html("검색", "<p>검색 결과가 없습니다</p>")
+    items = []
+    for row in range(config.jobkorea_rows):
+        posting = (page_no - 1) * config.jobkorea_rows + row + 1
+        items.append(
+            '<article class="list-item">'
+            f'<div class="list-section-corp"><a href="#">회사 {posting}</a></div>'
+            '<div class="information-title">'
+            f'<a href="{JOBKOREA_POSTING_PATH}{posting}">SI 개발자 {posting}</a>'
+            "</div></article>"
+        )
+    return page_html("검색", f'<article class="list">{"".join(items)}</article>')
+
+
+def jobkorea_posting_page(posting: int) -> str:
+    email = (
+        f'<span class="tahoma"><a class="devChargeEmail">hr{posting}@corp.example.com'
+        "</a></span>"
+        if posting % 4
+        else ""
+    )
+    return page_html(
+        "채용공고",
+        '<article class="artReadJobSum"><h3 class="hd_3">'
+        f"<span>회사 {posting}</span>\nSI 개발자 {posting}</h3></article>"
+        f"{email}"
+        '<div class="tbCol tbCoInfo"><dl class="tbList">'
+        "<dt>산업(업종)</dt><dd><svg><text>소프트웨어 개발</text></svg></dd>"
+        f'<dt>사원수</dt><dd><span class="tahoma">{posting * 3}</span>명</dd>'
+        f'<dt>설립년도</dt><dd><span class="tahoma">{1990 + posting % 30}</span>년</dd>'
+        "<dt>기업형태</dt><dd>중소기업\n (법인)</dd>"
+        '<dt>홈페이지</dt><dd><a class="devCoHomepageLink" '
+        f'href="http://corp{posting}.example.com">홈페이지</a></dd>'
+        "</dl></div>",
+    )
+
+
+def security_page() -> str:
+    return page_html(
+        "보안", '<p class="reasonExp">보안정책에 의해 접근이 차단되었습니다</p>'
+    )
+
+
+def make_handler(config: FixtureConfig):
+    class FixtureHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            time.sleep(config.delay())
+            if config.roll(config.error_rate):
+                self.send(500, page_html("오류", "<p>Internal Server Error</p>"))
+                return
+
+            url = urlparse(self.path)
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            if url.path == KATA_LIST_PATH:
+                self.send(200, kata_list_page(config, int(query.get("page", 1))))
+            elif url.path == KATA_POPUP_PATH:
+                self.send(
+                    200,
+                    kata_popup_page(
+                        query.get("businesscode", "0"), query.get("custcode", "0")
+                    ),
+                )
+            elif url.path == "/":
+                self.send(200, jobkorea_home_page())
+            elif url.path == JOBKOREA_SEARCH_PATH:
+                if config.challenge(self.path):
+                    self.send(200, security_page())
+                else:
+                    page_no = int(query.get("Page_No", 1))
+                    self.send(200, jobkorea_search_page(config, page_no))
+            elif url.path.startswith(JOBKOREA_POSTING_PATH):
+                if config.challenge(self.path):
+                    self.send(200, security_page())
+                else:
+                    posting = int(url.path.rsplit("/", 1)[-1])
+                    self.send(200, jobkorea_posting_page(posting))
+            else:
+                self.send(404, page_html("Not Found", "<p>Not Found</p>"))
+
+        def send(self, status: int, body: str) -> None:
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    return FixtureHandler
+
+
+class FixtureServer:
+    """Serve the fixtures from a background thread"""
+
+    def __init__(self, config: FixtureConfig, port: int = 0):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), make_handler(config))
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "FixtureServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the scraper fixtures")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--challenge-rate", type=float, default=0)
+    args = parser.parse_args()
+    config = FixtureConfig(
+        latency_ms=args.latency_ms,
+        error_rate=args.error_rate,
+        challenge_rate=args.challenge_rate,
+    )
+    with FixtureServer(config, args.port) as server:
+        print(f"Serving fixtures on {server.url}")
+        server.thread.join()
@@ -0,0 +1,70 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterator, Optional
+
+
+class PageArchive:
+    """Content-addressed, gzip-compressed store of fetched pages.
+
+    Page bodies live in `objects/<sha256>.gz` under the archive directory, so
+    identical pages are stored once. `index.jsonl` maps each URL to its
+    latest body, together with any metadata passed to `put` (for example the
+    company a posting belongs to). Threads and shard processes can record into
+    the same archive.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.objects = os.path.join(root, "objects")
+        self.index_path = os.path.join(root, "index.jsonl")
+        os.makedirs(self.objects, exist_ok=True)
+        self._index: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._index[entry["url"]] = entry
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects, f"{digest}.gz")
+
+    def put(self, url: str, html: str, **meta) -> str:
+        """Store the page for url and return its content hash"""
+        body = html.encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        entry = {"url": url, "sha256": digest, "ts": time.time(), **meta}
+        with self._lock:
+            if not os.path.exists(path):
+                temp_path = f"{path}.{os.getpid()}.tmp"
+                with gzip.open(temp_path, "wb") as f:
+                    f.write(body)
+                os.replace(temp_path, path)
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._index[url] = entry
+        return digest
+
+    def read(self, entry: dict) -> str:
+        with gzip.open(self._object_path(entry["sha256"]), "rb") as f:
+            return f.read().decode("utf-8")
+
+    def get(self, url: str) -> Optional[str]:
+        """The latest stored page for url, or None"""
+        entry = self._index.get(url)
+        return self.read(entry) if entry else None
+
+    def entries(self) -> Iterator[dict]:
+        """The latest index entry of every stored URL, in recording order"""
+        with self._lock:
+            entries = sorted(self._index.values(), key=lambda entry: entry["ts"])
+        return iter(entries)
+
+    def __len__(self) -> int:
+        return len(self._index)
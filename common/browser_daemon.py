@@ -0,0 +1,280 @@
+"""Long-lived Chromium fleet that scraper runs attach to over CDP.
+
+Starting Chromium costs more than many of our small jobs do. The daemon
+keeps `--browsers` warm Chromium processes running, each listening on its
+own remote-debugging port, health-checks them through /json/version and
+restarts any that die or stop answering. Scrapers ask the daemon's control
+endpoint for a browser and attach to it with connect_over_cdp; each worker
+then opens its own context in it, which takes milliseconds.
+
+    python -m common.browser_daemon --browsers 2 --port 9221
+    BROWSER_DAEMON_URL=http://127.0.0.1:9221 python Tour/main.py
+
+Control endpoints:
+
+    /browser    CDP URL of the healthy browser with the fewest handouts
+    /status     state of every browser in the fleet
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+from common.network import LEAN_LAUNCH_OPTIONS
+
+# Environment variable the scrapers read the daemon's control URL from
+DAEMON_URL_VARIABLE = "BROWSER_DAEMON_URL"
+
+
+def chromium_executable() -> str:
+    """Path of the Chromium build installed for Playwright"""
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as playwright:
+        return playwright.chromium.executable_path
+
+
+class ManagedBrowser:
+    """One Chromium process with a remote-debugging port"""
+
+    def __init__(self, executable: str, port: int, headless: bool = True):
+        self.executable = executable
+        self.port = port
+        self.headless = headless
+        self.process: Optional[subprocess.Popen] = None
+        self.user_data_dir: Optional[str] = None
+        self.failures = 0
+        self.restarts = 0
+        self.handouts = 0
+
+    @property
+    def cdp_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self, timeout: float = 30) -> None:
+        self.user_data_dir = tempfile.mkdtemp(prefix=f"browser_daemon_{self.port}_")
+        args = [
+            self.executable,
+            *LEAN_LAUNCH_OPTIONS["args"],
+            f"--remote-debugging-port={self.port}",
+            "--remote-debugging-address=127.0.0.1",
+            f"--user-data-dir={self.user_data_dir}",
+            "--no-default-browser-check",
+        ]
+        if self.headless:
+            args.append("--headless=new")
+        args.append("about:blank")
+        self.process = subprocess.Popen(
+            args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+
+        deadline = time.monotonic() + timeout
+        while not self.healthy():
+            if self.process.poll() is not None or time.monotonic() > deadline:
+                self.stop()
+                raise RuntimeError(f"Chromium on port {self.port} did not start")
+            time.sleep(0.2)
+        self.failures = 0
+
+    def healthy(self) -> bool:
+        """Check that the process runs and its DevTools endpoint answers"""
+        if self.process is None or self.process.poll() is not None:
+            return False
+        try:
+            with urllib.request.urlopen(
+                f"{self.cdp_url}/json/version", timeout=2
+            ) as response:
+                return "webSocketDebuggerUrl" in json.load(response)
+        except (OSError, ValueError):
+            return False
+
+    def stop(self) -> None:
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        self.process = None
+        if self.user_data_dir:
+            shutil.rmtree(self.user_data_dir, ignore_errors=True)
+            self.user_data_dir = None
+
+    def restart(self) -> None:
+        self.stop()
+        self.start()
+        self.restarts += 1
+
+    def status(self) -> dict:
+        return {
+            "cdp_url": self.cdp_url,
+            "pid": self.process.pid if self.process else None,
+            "healthy": self.failures == 0 and self.process is not None,
+            "restarts": self.restarts,
+            "handouts": self.handouts,
+        }
+
+
+class BrowserDaemon:
+    """Keep a fleet of browsers running and hand them out to scrapers.
+
+    Every check_interval seconds each browser is checked; one that has
+    exited, or failed max_failures checks in a row, is restarted. Clients
+    connected to it lose their connection and have to attach again.
+    """
+
+    def __init__(
+        self,
+        browsers: int = 2,
+        port: int = 9221,
+        first_browser_port: int = 9222,
+        headless: bool = True,
+        check_interval: float = 5,
+        max_failures: int = 2,
+    ):
+        executable = chromium_executable()
+        self.browsers: List[ManagedBrowser] = [
+            ManagedBrowser(executable, first_browser_port + i, headless)
+            for i in range(browsers)
+        ]
+        self.check_interval = check_interval
+        self.max_failures = max_failures
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self.make_handler())
+        self.httpd.daemon_threads = True
+
+    def hand_out(self) -> Optional[str]:
+        """CDP URL of the healthy browser with the fewest handouts"""
+        with self.lock:
+            healthy = [
+                browser
+                for browser in self.browsers
+                if browser.failures == 0 and browser.process is not None
+            ]
+            if not healthy:
+                return None
+            browser = min(healthy, key=lambda browser: browser.handouts)
+            browser.handouts += 1
+            return browser.cdp_url
+
+    def check(self) -> None:
+        for browser in self.browsers:
+            if browser.healthy():
+                browser.failures = 0
+                continue
+            with self.lock:
+                browser.failures += 1
+            exited = browser.process is None or browser.process.poll() is not None
+            if exited or browser.failures >= self.max_failures:
+                print(f"Restarting browser on port {browser.port}")
+                try:
+                    browser.restart()
+                except RuntimeError as e:
+                    print(str(e))
+
+    def watch(self) -> None:
+        while not self.stopped.wait(self.check_interval):
+            self.check()
+
+    def make_handler(self):
+        daemon = self
+
+        class ControlHandler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path == "/browser":
+                    cdp_url = daemon.hand_out()
+                    if cdp_url is None:
+                        self.send(503, {"error": "no healthy browser"})
+                    else:
+                        self.send(200, {"cdp_url": cdp_url})
+                elif self.path == "/status":
+                    self.send(200, [browser.status() for browser in daemon.browsers])
+                else:
+                    self.send(404, {"error": "not found"})
+
+            def send(self, status: int, body) -> None:
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return ControlHandler
+
+    def serve(self) -> None:
+        for browser in self.browsers:
+            browser.start()
+            print(f"Browser ready at {browser.cdp_url}")
+        watcher = threading.Thread(target=self.watch, daemon=True)
+        watcher.start()
+        host, port = self.httpd.server_address[:2]
+        print(f"Browser daemon listening on http://{host}:{port}")
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.stopped.set()
+            self.httpd.server_close()
+            for browser in self.browsers:
+                browser.stop()
+
+
+def open_browser(playwright, launch_options: dict, daemon_url: Optional[str] = None):
+    """Attach to a browser from the daemon, or launch one if there is none.
+
+    Only headless launches attach: the daemon's browsers are headless and
+    lean, so a run that needs a visible window for a manual login or a
+    security check always launches its own browser.
+
+    Closing a browser that was attached to only disconnects from it and
+    closes the contexts this client created; the daemon's Chromium keeps
+    running for the next run.
+    """
+    daemon_url = daemon_url or os.environ.get(DAEMON_URL_VARIABLE)
+    if daemon_url and not launch_options.get("headless", True):
+        print("Headed browser requested, not attaching to the browser daemon")
+    elif daemon_url:
+        try:
+            with urllib.request.urlopen(
+                f"{daemon_url.rstrip('/')}/browser", timeout=5
+            ) as response:
+                cdp_url = json.load(response)["cdp_url"]
+            return playwright.chromium.connect_over_cdp(cdp_url)
+        except Exception as e:
+            print(f"Browser daemon unavailable ({str(e)}), launching a browser")
+    return playwright.chromium.launch(**launch_options)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a shared Chromium fleet")
+    parser.add_argument("--browsers", type=int, default=2)
+    parser.add_argument("--port", type=int, default=9221, help="control port")
+    parser.add_argument(
+        "--first-browser-port",
+        type=int,
+        default=9222,
+        help="remote-debugging port of the first browser; the others follow it",
+    )
+    parser.add_argument("--headed", action="store_true")
+    parser.add_argument("--check-interval", type=float, default=5)
+    args = parser.parse_args()
+    BrowserDaemon(
+        browsers=args.browsers,
+        port=args.port,
+        first_browser_port=args.first_browser_port,
+        headless=not args.headed,
+        check_interval=args.check_interval,
+    ).serve()
@@ -0,0 +1,253 @@
+import hashlib
+import math
+import os
+import re
+import struct
+import unicodedata
+from typing import Mapping, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+# Legal-form markers that vary between listings of the same company, e.g.
+# "(주)", "( 주 )", "주식회사" ("㈜" becomes "(주)" under NFKC first)
+LEGAL_FORM_PATTERN = re.compile(
+    r"\(\s*[주유사재합]\s*\)|주식회사|유한책임회사|유한회사|합자회사|합명회사|"
+    r"사단법인|재단법인"
+)
+
+# Anything but digits and the separators of a single phone number
+PHONE_TEXT_PATTERN = re.compile(r"[^\d\s+().-]")
+
+
+def normalize_company(name: str) -> str:
+    """Company name without legal-form markers and extra whitespace"""
+    text = unicodedata.normalize("NFKC", name)
+    stripped = " ".join(LEGAL_FORM_PATTERN.sub(" ", text).split())
+    return stripped or " ".join(text.split())
+
+
+def company_key(name: str) -> str:
+    """Form of a company name used to detect duplicates"""
+    return normalize_company(name).replace(" ", "").casefold()
+
+
+def normalize_email(email: str) -> str:
+    email = email.strip()
+    if email.lower().startswith("mailto:"):
+        email = email[len("mailto:") :]
+    return email.lower()
+
+
+def normalize_phone(phone: str) -> str:
+    """Format a Korean phone number as 02-123-4567, 010-1234-5678 or 1588-1234.
+
+    Numbers that do not look like a single Korean number (several numbers,
+    extensions) are returned with their whitespace collapsed.
+    """
+    if PHONE_TEXT_PATTERN.search(phone):
+        return " ".join(phone.split())  # Words such as 내선 or ext., or a list
+    digits = re.sub(r"\D", "", phone)
+    if digits.startswith("82"):
+        digits = "0" + digits[2:].lstrip("0")  # +82 (0)2-... to 02-...
+    if digits.startswith("02") and len(digits) in (9, 10):
+        return f"02-{digits[2:-4]}-{digits[-4:]}"
+    if digits.startswith("0") and len(digits) in (10, 11):
+        return f"{digits[:3]}-{digits[3:-4]}-{digits[-4:]}"
+    if len(digits) == 8 and digits[:2] in ("15", "16", "18"):
+        return f"{digits[:4]}-{digits[4:]}"
+    return " ".join(phone.split())
+
+
+def normalize_url(url: str) -> str:
+    """URL with a scheme, a lowercase host and no fragment or trailing slash"""
+    url = url.strip()
+    if not url:
+        return ""
+    if "://" not in url:
+        url = "http://" + url
+    parts = urlsplit(url)
+    return urlunsplit(
+        (
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            parts.path.rstrip("/"),
+            parts.query,
+            "",
+        )
+    )
+
+
+def url_key(url: str) -> str:
+    """Form of a URL used to detect duplicates, ignoring scheme and www."""
+    parts = urlsplit(normalize_url(url))
+    host = parts.netloc.removeprefix("www.")
+    return host + parts.path
+
+
+def hashed_key(*parts: str) -> bytes:
+    """8-byte key for a duplicate check, small enough to keep millions in memory"""
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=8).digest()
+
+
+class SeenSet:
+    """Exact set of hashed keys, optionally kept in a file across runs.
+
+    The file is a plain concatenation of 8-byte keys; keys added in this run
+    are appended to it by save().
+    """
+
+    key_size = 8
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._keys = set()
+        self._pending = []
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                while chunk := f.read(self.key_size * 4096):
+                    for i in range(0, len(chunk), self.key_size):
+                        self._keys.add(chunk[i : i + self.key_size])
+
+    def add(self, key: bytes) -> bool:
+        """Add key. Returns False if it was already seen."""
+        if key in self._keys:
+            return False
+        self._keys.add(key)
+        if self.path:
+            self._pending.append(key)
+        return True
+
+    def save(self) -> None:
+        if self.path and self._pending:
+            with open(self.path, "ab") as f:
+                f.write(b"".join(self._pending))
+            self._pending = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class BloomFilter:
+    """Fixed-size probabilistic set of hashed keys, optionally kept in a file.
+
+    Memory is set by capacity and error_rate alone (about 1.8 MB per million
+    keys at 0.1%), however many keys are added. A new key is wrongly reported
+    as seen with probability error_rate once capacity keys are in; a seen key
+    is never reported as new.
+    """
+
+    header = struct.Struct("<8sQI")
+    magic = b"BLOOM001"
+
+    def __init__(
+        self, capacity: int, error_rate: float = 0.001, path: Optional[str] = None
+    ):
+        self.path = path
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+        # A saved filter keeps its own size, whatever capacity is asked for now
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                magic, self.size, self.hashes = self.header.unpack(
+                    f.read(self.header.size)
+                )
+                if magic != self.magic:
+                    raise ValueError(f"{path} is not a Bloom filter file")
+                self.bits = bytearray(f.read())
+
+    def add(self, key: bytes) -> bool:
+        """Add key. Returns False if it was (probably) already seen."""
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        step = int.from_bytes(digest[8:], "little") | 1
+        new = False
+        for i in range(self.hashes):
+            bit = (first + i * step) % self.size
+            mask = 1 << (bit & 7)
+            if not self.bits[bit >> 3] & mask:
+                self.bits[bit >> 3] |= mask
+                new = True
+        return new
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(self.header.pack(self.magic, self.size, self.hashes))
+            f.write(self.bits)
+        os.replace(temp_path, self.path)
+
+
+def open_seen_store(path: Optional[str] = None, capacity: Optional[int] = None):
+    """A Bloom filter when capacity is given, otherwise an exact SeenSet"""
+    if capacity:
+        return BloomFilter(capacity, path=path)
+    return SeenSet(path)
+
+
+class ContactStage:
+    """Canonicalize contact records and drop duplicates in one streaming pass.
+
+    The arguments name the column of each kind of value in the records
+    passed to process(); records can be dicts or row tuples (with integer
+    columns). A record is a duplicate when its email was seen before, or,
+    without an email, when its company and website were.
+    """
+
+    normalizers = {
+        "company": normalize_company,
+        "email": normalize_email,
+        "phone": normalize_phone,
+        "url": normalize_url,
+    }
+
+    def __init__(self, company=None, email=None, phone=None, url=None, seen=None):
+        self.columns = {"company": company, "email": email, "phone": phone, "url": url}
+        self.seen = seen if seen is not None else SeenSet()
+        self.passed = 0
+        self.duplicates = 0
+
+    def _value(self, record, role: str) -> str:
+        column = self.columns[role]
+        return record[column] if column is not None else ""
+
+    def key(self, record) -> bytes:
+        email = self._value(record, "email")
+        if email:
+            return hashed_key("email", email)
+        return hashed_key(
+            "company",
+            company_key(self._value(record, "company")),
+            url_key(self._value(record, "url")),
+        )
+
+    def normalize(self, record):
+        """A canonical copy of record, without checking it against seen"""
+        record = dict(record) if isinstance(record, Mapping) else list(record)
+        for role, normalize in self.normalizers.items():
+            column = self.columns[role]
+            if column is not None and record[column]:
+                record[column] = normalize(record[column])
+        return record
+
+    def is_new(self, record) -> bool:
+        """Record a canonical record as seen. Returns False for a duplicate."""
+        if not self.seen.add(self.key(record)):
+            self.duplicates += 1
+            return False
+        self.passed += 1
+        return True
+
+    def process(self, record):
+        """The canonical record, or None if it is a duplicate"""
+        record = self.normalize(record)
+        return record if self.is_new(record) else None
+
+    def save(self) -> None:
+        """Write keys seen in this run to the seen store's file, if any"""
+        self.seen.save()
+
+    def summary(self) -> str:
+        return f"Contacts kept: {self.passed} | duplicates dropped: {self.duplicates}"
@@ -0,0 +1,137 @@
+from html.parser import HTMLParser
+from typing import Dict, Iterator, List, Optional
+
+# Elements that never have children or an end tag
+VOID_ELEMENTS = {
+    "area",
+    "base",
+    "br",
+    "col",
+    "embed",
+    "hr",
+    "img",
+    "input",
+    "link",
+    "meta",
+    "source",
+    "track",
+    "wbr",
+}
+
+# Elements closed implicitly when a sibling of one of these tags starts
+IMPLICIT_CLOSE = {
+    "dt": {"dt", "dd"},
+    "dd": {"dt", "dd"},
+    "li": {"li"},
+    "p": {"p"},
+    "tr": {"tr"},
+    "td": {"td", "th", "tr"},
+    "th": {"td", "th", "tr"},
+    "option": {"option"},
+}
+
+
+class Node:
+    """An element of a parsed HTML document"""
+
+    def __init__(self, tag: str, attrs: Dict[str, str], parent: Optional["Node"]):
+        self.tag = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.children: List[object] = []  # Nodes and text strings
+
+    @property
+    def classes(self) -> List[str]:
+        return (self.attrs.get("class") or "").split()
+
+    def get(self, name: str) -> Optional[str]:
+        return self.attrs.get(name)
+
+    def text(self) -> str:
+        """Concatenated text of the element and its descendants, like textContent"""
+        return "".join(
+            child if isinstance(child, str) else child.text() for child in self.children
+        )
+
+    def descendants(self) -> Iterator["Node"]:
+        """Descendant elements in document order"""
+        stack = [child for child in reversed(self.children) if isinstance(child, Node)]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(
+                child for child in reversed(node.children) if isinstance(child, Node)
+            )
+
+    def matches(self, simple: str) -> bool:
+        """Match a simple selector such as "div", ".tbList" or "dl.tbList" """
+        tag, *classes = simple.split(".")
+        if tag and tag != self.tag:
+            return False
+        return all(name in self.classes for name in classes)
+
+    def _iter_select(self, selector: str) -> Iterator["Node"]:
+        *ancestors, last = selector.split()
+        nodes = [self]
+        for simple in ancestors:
+            nodes = list(self._match_within(nodes, simple))
+        return self._match_within(nodes, last)
+
+    @staticmethod
+    def _match_within(nodes: List["Node"], simple: str) -> Iterator["Node"]:
+        seen = set()
+        for node in nodes:
+            for match in node.descendants():
+                if id(match) not in seen and match.matches(simple):
+                    seen.add(id(match))
+                    yield match
+
+    def select(self, selector: str) -> List["Node"]:
+        """Find descendants matching a selector of simple selectors and spaces"""
+        return list(self._iter_select(selector))
+
+    def select_one(self, selector: str) -> Optional["Node"]:
+        """The first match of select, without looking further"""
+        return next(self._iter_select(selector), None)
+
+
+class TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#document", {}, None)
+        self.current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        # A new row closes the open cell and then the open row
+        closes = IMPLICIT_CLOSE.get(self.current.tag)
+        while closes and tag in closes:
+            self.current = self.current.parent
+            closes = IMPLICIT_CLOSE.get(self.current.tag)
+
+        node = Node(tag, {name: value or "" for name, value in attrs}, self.current)
+        self.current.children.append(node)
+        if tag not in VOID_ELEMENTS:
+            self.current = node
+
+    def handle_startendtag(self, tag, attrs):
+        node = Node(tag, {name: value or "" for name, value in attrs}, self.current)
+        self.current.children.append(node)
+
+    def handle_endtag(self, tag):
+        # Close up to the matching open element, ignoring stray end tags
+        node = self.current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self.current = node.parent
+
+    def handle_data(self, data):
+        self.current.children.append(data)
+
+
+def parse_html(html: str) -> Node:
+    """Parse an HTML document into a tree of Nodes"""
+    builder = TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
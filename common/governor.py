@@ -0,0 +1,153 @@
+import os
+import threading
+from typing import Callable, Optional
+
+try:
+    import psutil
+except ImportError:  # Falls back to /proc, or no RSS limit without it
+    psutil = None
+
+
+def process_tree_rss_mb(pid: Optional[int] = None) -> Optional[float]:
+    """Resident memory of a process and all its descendants, in MiB.
+
+    Chromium runs as child processes of the Playwright driver, so the
+    browser's memory only shows up in the tree. Returns None when it cannot
+    be measured on this platform.
+    """
+    pid = pid or os.getpid()
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+            total = 0
+            for process in processes:
+                try:
+                    total += process.memory_info().rss
+                except psutil.Error:
+                    pass  # Exited while we were looking
+            return total / (1024 * 1024)
+        except psutil.Error:
+            return None
+
+    if not os.path.isdir("/proc"):
+        return None
+
+    # Map every process to its parent, then walk down from pid
+    children = {}
+    rss_pages = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                stat = f.read()
+            with open(f"/proc/{entry}/statm", "r") as f:
+                rss_pages[int(entry)] = int(f.read().split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        # The command name may contain spaces, so split after its closing ")"
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+
+    total = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        total += rss_pages.get(current, 0)
+        stack.extend(children.get(current, []))
+    return total * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+class ResourceGovernor:
+    """Decide when a browser page has done enough work to be replaced.
+
+    A page is recycled after max_navigations, or when the memory of this
+    process and its browsers passes max_rss_mb (checked every check_every
+    navigations, since walking the process tree is not free).
+    """
+
+    def __init__(
+        self,
+        max_navigations: int = 200,
+        max_rss_mb: Optional[float] = None,
+        check_every: int = 10,
+    ):
+        self.max_navigations = max_navigations
+        self.max_rss_mb = max_rss_mb
+        self.check_every = check_every
+        self.recycles = 0
+        self.peak_rss_mb = 0.0
+        self._lock = threading.Lock()
+
+    def should_recycle(self, navigations: int) -> bool:
+        if self.max_navigations and navigations >= self.max_navigations:
+            return True
+        if not self.max_rss_mb or navigations % self.check_every:
+            return False
+        rss = process_tree_rss_mb()
+        if rss is None:
+            return False
+        with self._lock:
+            self.peak_rss_mb = max(self.peak_rss_mb, rss)
+        return rss >= self.max_rss_mb
+
+    def record_recycle(self) -> None:
+        with self._lock:
+            self.recycles += 1
+
+    def summary(self) -> str:
+        text = f"Pages recycled: {self.recycles}"
+        if self.peak_rss_mb:
+            text += f" | peak RSS: {self.peak_rss_mb:.0f} MiB"
+        return text
+
+
+class PageRecycler:
+    """Own a browser context and page, replacing both when the governor says so.
+
+    The new context is created from the old one's storage state, so cookies
+    and a login carry over. setup is called with every new context, e.g. to
+    install request blocking. Like any sync Playwright object, a recycler
+    must stay on the thread that created it.
+    """
+
+    def __init__(
+        self,
+        browser,
+        governor: ResourceGovernor,
+        setup: Optional[Callable] = None,
+        context=None,
+        storage_state=None,
+    ):
+        self.browser = browser
+        self.governor = governor
+        self.setup = setup
+        self.navigations = 0
+        if context is None:
+            context = self._new_context(storage_state)
+        self.context = context
+        self.page = context.new_page()
+
+    def _new_context(self, storage_state=None):
+        if storage_state is not None:
+            context = self.browser.new_context(storage_state=storage_state)
+        else:
+            context = self.browser.new_context()
+        if self.setup:
+            self.setup(context)
+        return context
+
+    def navigated(self, count: int = 1) -> None:
+        """Count navigations on the page and recycle it when due"""
+        self.navigations += count
+        if self.governor.should_recycle(self.navigations):
+            self.recycle()
+
+    def recycle(self) -> None:
+        storage_state = self.context.storage_state()
+        self.context.close()
+        self.context = self._new_context(storage_state)
+        self.page = self.context.new_page()
+        self.navigations = 0
+        self.governor.record_recycle()
@@ -0,0 +1,143 @@
+import json
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+# Recent samples kept per stage for percentiles
+SAMPLE_LIMIT = 10000
+
+
+class StageStats:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=SAMPLE_LIMIT)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.samples.append(seconds)
+
+    def percentile(self, q: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+
+class Metrics:
+    """Per-stage timings and event counters for a scraper run.
+
+    Time a stage with `with metrics.stage("navigation"): ...` and count events
+    with `metrics.count("retries")`. If `events_path` is given, every timing
+    and count is also appended to it as a JSON line. `summary` gives an
+    end-of-run report and `to_prometheus` the Prometheus text format.
+    Safe to share between threads.
+    """
+
+    def __init__(self, scraper: str, events_path: Optional[str] = None):
+        self.scraper = scraper
+        self.events_path = events_path
+        self.stages: Dict[str, StageStats] = {}
+        self.counters = Counter()
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._events = None
+
+    def _emit(self, event: dict) -> None:
+        if self.events_path is None:
+            return
+        if self._events is None:
+            self._events = open(self.events_path, "a", encoding="utf-8")
+        self._events.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.stages.setdefault(stage, StageStats()).add(seconds)
+            self._emit(
+                {
+                    "ts": time.time(),
+                    "scraper": self.scraper,
+                    "stage": stage,
+                    "seconds": round(seconds, 6),
+                }
+            )
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += amount
+            self._emit(
+                {
+                    "ts": time.time(),
+                    "scraper": self.scraper,
+                    "counter": name,
+                    "amount": amount,
+                }
+            )
+
+    def summary(self) -> str:
+        with self._lock:
+            lines = [f"Run time: {time.time() - self.started:.1f}s"]
+            for name, stats in sorted(
+                self.stages.items(), key=lambda item: -item[1].total
+            ):
+                lines.append(
+                    f"  {name:<12} n={stats.count:<6} total={stats.total:.1f}s "
+                    f"mean={stats.total / stats.count * 1000:.0f}ms "
+                    f"p50={stats.percentile(50) * 1000:.0f}ms "
+                    f"p95={stats.percentile(95) * 1000:.0f}ms "
+                    f"max={stats.max * 1000:.0f}ms"
+                )
+            if self.counters:
+                lines.append(
+                    "  "
+                    + ", ".join(
+                        f"{name}: {count}"
+                        for name, count in sorted(self.counters.items())
+                    )
+                )
+            return "\n".join(lines)
+
+    def to_prometheus(self) -> str:
+        label = f'scraper="{self.scraper}"'
+        lines = [
+            "# HELP scraper_stage_seconds Time spent in each scraper stage",
+            "# TYPE scraper_stage_seconds summary",
+        ]
+        with self._lock:
+            for name, stats in sorted(self.stages.items()):
+                labels = f'{label},stage="{name}"'
+                for q in (50, 95, 99):
+                    lines.append(
+                        f'scraper_stage_seconds{{{labels},quantile="{q / 100}"}} '
+                        f"{stats.percentile(q):.6f}"
+                    )
+                lines.append(f"scraper_stage_seconds_sum{{{labels}}} {stats.total:.6f}")
+                lines.append(f"scraper_stage_seconds_count{{{labels}}} {stats.count}")
+            lines.append("# HELP scraper_events_total Events counted during the run")
+            lines.append("# TYPE scraper_events_total counter")
+            for name, count in sorted(self.counters.items()):
+                lines.append(f'scraper_events_total{{{label},event="{name}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+
+    def close(self) -> None:
+        with self._lock:
+            if self._events is not None:
+                self._events.close()
+                self._events = None
@@ -0,0 +1,112 @@
+import threading
+from collections import Counter
+from urllib.parse import urlparse
+
+# Resources the scrapers never read
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
+# Ad and tracker domains, matched against the request host and its parents
+BLOCKED_DOMAINS = {
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googlesyndication.com",
+    "doubleclick.net",
+    "googleadservices.com",
+    "facebook.net",
+    "facebook.com",
+    "criteo.com",
+    "criteo.net",
+    "adnxs.com",
+    "kakaocdn.net",
+    "daumcdn.net",
+    "wcs.naver.net",
+    "hotjar.com",
+}
+
+# Headless Chromium without the features a scraper does not need
+LEAN_LAUNCH_OPTIONS = {
+    "headless": True,
+    "args": [
+        "--disable-extensions",
+        "--disable-gpu",
+        "--disable-background-networking",
+        "--mute-audio",
+        "--no-first-run",
+        "--blink-settings=imagesEnabled=false",
+    ],
+}
+
+# Visible Chromium that renders pages normally, for a person to log in and
+# pass security checks in
+INTERACTIVE_LAUNCH_OPTIONS = {"headless": False, "args": ["--no-first-run"]}
+
+
+def matches_domain(host: str, domains) -> bool:
+    """Check whether host is one of domains or a subdomain of one"""
+    host = host.lower()
+    return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+
+class RequestBlocker:
+    """Abort requests for unneeded resource types and domains.
+
+    Install it on a page or browser context with `install`. Domains in
+    `allowed_domains` are never blocked, whatever their resource type.
+    Counters are shared by every page it is installed on.
+    """
+
+    def __init__(
+        self,
+        blocked_types=BLOCKED_RESOURCE_TYPES,
+        blocked_domains=BLOCKED_DOMAINS,
+        allowed_domains=(),
+    ):
+        self.blocked_types = set(blocked_types)
+        self.blocked_domains = set(blocked_domains)
+        self.allowed_domains = set(allowed_domains)
+        self.blocked_requests = Counter()  # by resource type
+        self.allowed_requests = 0
+        self.received_bytes = 0
+        self._lock = threading.Lock()
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        host = urlparse(url).hostname or ""
+        if matches_domain(host, self.allowed_domains):
+            return False
+        return resource_type in self.blocked_types or matches_domain(
+            host, self.blocked_domains
+        )
+
+    def install(self, target) -> None:
+        """Route every request of a page or browser context through the blocker"""
+        target.route("**/*", self._handle_route)
+        target.on("response", self._count_response)
+
+    def _handle_route(self, route) -> None:
+        request = route.request
+        if self.should_block(request.resource_type, request.url):
+            with self._lock:
+                self.blocked_requests[request.resource_type] += 1
+            route.abort()
+        else:
+            with self._lock:
+                self.allowed_requests += 1
+            route.continue_()
+
+    def _count_response(self, response) -> None:
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            with self._lock:
+                self.received_bytes += int(length)
+
+    def summary(self) -> str:
+        blocked = sum(self.blocked_requests.values())
+        by_type = ", ".join(
+            f"{resource_type}: {count}"
+            for resource_type, count in self.blocked_requests.most_common()
+        )
+        return (
+            f"Requests blocked: {blocked} ({by_type or 'none'}) | "
+            f"allowed: {self.allowed_requests} | "
+            f"received: {self.received_bytes / 1024:.1f} KiB"
+        )
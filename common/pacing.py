@@ -0,0 +1,75 @@
+import threading
+import time
+
+
+class AdaptiveRateLimiter:
+    """Token bucket whose rate is tuned additive-increase/multiplicative-decrease.
+
+    Call `acquire` before each request, then report the outcome with
+    `record_success` or `record_challenge`. Clean responses raise the rate by
+    `increase` requests/s up to `max_rate`; a challenge multiplies it by
+    `decrease` (down to `min_rate`) and empties the bucket. Safe to share
+    between threads.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        min_rate: float = 0.05,
+        max_rate: float = 5.0,
+        increase: float = 0.05,
+        decrease: float = 0.5,
+        burst: float = 1.0,
+    ):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.burst = burst
+        self.requests = 0
+        self.challenges = 0
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._started = self._updated
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> None:
+        """Block until a request may be sent"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self.requests += 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def record_challenge(self) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self.challenges += 1
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self._tokens = 0
+
+    def summary(self) -> str:
+        with self._lock:
+            elapsed = time.monotonic() - self._started
+            challenge_rate = self.challenges / self.requests if self.requests else 0
+            effective = self.requests / elapsed if elapsed else 0
+            return (
+                f"Requests: {self.requests} | challenges: {self.challenges} "
+                f"({challenge_rate:.1%}) | effective: {effective:.2f} req/s | "
+                f"current rate: {self.rate:.2f} req/s"
+            )
@@ -0,0 +1,116 @@
+import json
+import os
+import threading
+import time
+from collections import Counter
+from typing import Dict, List
+
+TIMEOUT = "timeout"
+NAVIGATION = "navigation"
+MISSING_ELEMENT = "missing_element"
+OTHER = "error"
+
+# Failure kinds worth trying again; anything else goes straight to dead letters
+RETRYABLE = {TIMEOUT, NAVIGATION, MISSING_ELEMENT}
+
+
+class MissingElementError(Exception):
+    """A page loaded but the element holding the data was not on it"""
+
+
+def classify_failure(error: Exception) -> str:
+    """Sort an exception into timeout, navigation, missing element or other"""
+    if isinstance(error, MissingElementError):
+        return MISSING_ELEMENT
+    name = type(error).__name__
+    message = str(error)
+    if "Timeout" in name or "Timeout" in message.split(":", 1)[0]:
+        return TIMEOUT
+    if (
+        "net::" in message
+        or "NS_ERROR" in message
+        or name in ("ConnectionError", "HTTPError", "SSLError")
+    ):
+        return NAVIGATION
+    return OTHER
+
+
+def _key_id(key: Dict[str, str]) -> str:
+    return json.dumps(key, sort_keys=True, ensure_ascii=False)
+
+
+class RetryQueue:
+    """Failed records waiting to be tried again, with a dead-letter file.
+
+    Report a failure with `add_failure(key, error)`. Retryable failures are
+    handed back by `next_round`, which first waits `base_delay * 2**round`
+    seconds. Records that fail `max_attempts` times, or fail in a way that
+    is not worth retrying, are appended to `dead_letter_path` as JSON lines
+    that `load_dead_letters` reads back for a replay run. Safe to share
+    between threads.
+    """
+
+    def __init__(
+        self, dead_letter_path: str, max_attempts: int = 3, base_delay: float = 5.0
+    ):
+        self.dead_letter_path = dead_letter_path
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.attempts = Counter()
+        self.dead_letters = 0
+        self._pending: Dict[str, Dict[str, str]] = {}
+        self._round = 0
+        self._lock = threading.Lock()
+
+    def add_failure(self, key: Dict[str, str], error: Exception) -> None:
+        kind = classify_failure(error)
+        key_id = _key_id(key)
+        with self._lock:
+            self.attempts[key_id] += 1
+            attempts = self.attempts[key_id]
+            if kind in RETRYABLE and attempts < self.max_attempts:
+                self._pending[key_id] = key
+                return
+
+            self.dead_letters += 1
+            with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+                record = {
+                    "key": key,
+                    "kind": kind,
+                    "error": str(error).splitlines()[0] if str(error) else "",
+                    "attempts": attempts,
+                    "ts": time.time(),
+                }
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def next_round(self) -> List[Dict[str, str]]:
+        """Wait out the backoff and return the keys to try again, if any"""
+        with self._lock:
+            if not self._pending:
+                return []
+            delay = self.base_delay * 2**self._round
+            self._round += 1
+        print(f"\nRetrying failed records in {delay:.0f}s...")
+        time.sleep(delay)
+        with self._lock:
+            keys = list(self._pending.values())
+            self._pending.clear()
+        return keys
+
+    def summary(self) -> str:
+        return (
+            f"Failed records: {len(self.attempts)} | "
+            f"dead letters: {self.dead_letters} ({self.dead_letter_path})"
+        )
+
+
+def load_dead_letters(path: str) -> List[Dict[str, str]]:
+    """Read the keys from a dead-letter file, without duplicates"""
+    keys = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    key = json.loads(line)["key"]
+                    keys.setdefault(_key_id(key), key)
+    return list(keys.values())
@@ -0,0 +1,84 @@
+import csv
+import itertools
+import multiprocessing
+import os
+import zlib
+from typing import Callable, Iterable, List, Optional, Sequence
+
+
+def shard_of(key: str, shard_count: int) -> int:
+    """Stable shard index for a key, the same on every machine and run"""
+    return zlib.crc32(key.encode("utf-8")) % shard_count
+
+
+def shard_path(path: str, shard_index: int) -> str:
+    """Output path for one shard, e.g. results.csv -> results.shard2.csv"""
+    stem, suffix = os.path.splitext(path)
+    return f"{stem}.shard{shard_index}{suffix}"
+
+
+def run_processes(target: Callable, args_list: Sequence[tuple]) -> List[int]:
+    """Run target(*args) in one process per args tuple and wait for all of them.
+
+    Uses the spawn start method, so each process starts clean with its own
+    browser. Returns the exit codes in the order of args_list.
+    """
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=target, args=args) for args in args_list]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    exit_codes = [process.exitcode for process in processes]
+    for index, code in enumerate(exit_codes):
+        if code != 0:
+            print(f"Shard process {index} exited with code {code}")
+    return exit_codes
+
+
+def merge_csv_files(
+    paths: Iterable[str],
+    output: str,
+    key_columns: Sequence[str],
+    sort_key: Optional[Callable[[dict], object]] = None,
+    limit: Optional[int] = None,
+    encoding: str = "utf-8",
+    row_filter: Optional[Callable[[dict], Optional[dict]]] = None,
+) -> int:
+    """Merge shard CSV files into one file without duplicate keys.
+
+    Rows are deduplicated on key_columns (the first one seen wins), ordered
+    by sort_key so the result does not depend on how work was split, passed
+    through row_filter in that order (a row it returns None for is dropped)
+    and cut at limit. Rows past the limit never reach row_filter, so a
+    filter that records what it kept only sees rows that are written.
+    Missing shard files are skipped. Returns the rows written.
+    """
+    fieldnames = None
+    rows = {}
+    for path in paths:
+        if not os.path.exists(path):
+            print(f"Shard file {path} not found, skipping")
+            continue
+        with open(path, "r", newline="", encoding=encoding) as f:
+            reader = csv.DictReader(f)
+            fieldnames = fieldnames or reader.fieldnames
+            for row in reader:
+                rows.setdefault(tuple(row[column] for column in key_columns), row)
+
+    merged = list(rows.values())
+    if sort_key is not None:
+        merged.sort(key=sort_key)
+    kept = iter(merged)
+    if row_filter is not None:
+        kept = (row for row in map(row_filter, kept) if row is not None)
+    if limit is not None:
+        kept = itertools.islice(kept, limit)
+    merged = list(kept)
+
+    with open(output, "w", newline="", encoding=encoding) as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames or list(key_columns))
+        writer.writeheader()
+        writer.writerows(merged)
+    return len(merged)
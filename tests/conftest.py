@@ -0,0 +1,23 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# The scrapers are scripts, not packages, and import their neighbours directly
+for path in (ROOT, ROOT / "Jobkorea", ROOT / "Tour"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+
+@pytest.fixture(scope="session")
+def tour():
+    """Tour/main.py, loaded under a name that does not clash with other mains"""
+    spec = importlib.util.spec_from_file_location(
+        "tour_main", ROOT / "Tour" / "main.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,108 @@
+import pytest
+
+from common.contacts import (
+    BloomFilter,
+    ContactStage,
+    SeenSet,
+    company_key,
+    hashed_key,
+    normalize_company,
+    normalize_email,
+    normalize_phone,
+    normalize_url,
+    url_key,
+)
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("(주)가나다", "가나다"),
+        ("㈜ 가나다", "가나다"),
+        ("주식회사  여행나라", "여행나라"),
+        ("가나다 ( 유 )", "가나다"),
+        ("(주)", "(주)"),
+    ],
+)
+def test_normalize_company(name, expected):
+    assert normalize_company(name) == expected
+
+
+def test_company_key_ignores_spacing_and_case():
+    assert company_key("(주) Ganada Soft") == company_key("ganadasoft")
+
+
+@pytest.mark.parametrize(
+    "phone, expected",
+    [
+        ("02 123 4567", "02-123-4567"),
+        ("0212345678", "02-1234-5678"),
+        ("+82 (0)31-123-4567", "031-123-4567"),
+        ("010.1234.5678", "010-1234-5678"),
+        ("1588 1234", "1588-1234"),
+        ("02-123-4567  내선 12", "02-123-4567 내선 12"),
+    ],
+)
+def test_normalize_phone(phone, expected):
+    assert normalize_phone(phone) == expected
+
+
+def test_normalize_email_and_url():
+    assert normalize_email(" mailto:HR@Example.COM ") == "hr@example.com"
+    assert normalize_url("WWW.Example.com/jobs/#top") == "http://www.example.com/jobs"
+    assert url_key("https://www.example.com/") == url_key("example.com")
+
+
+def test_contact_stage_drops_duplicates_after_normalizing():
+    stage = ContactStage(company="company", email="email", phone="tel", url="website")
+    first = {"company": "주식회사 여행", "email": "A@x.com", "tel": "", "website": ""}
+    again = {"company": "여행", "email": "a@X.com ", "tel": "", "website": ""}
+
+    assert stage.process(first) == {
+        "company": "여행",
+        "email": "a@x.com",
+        "tel": "",
+        "website": "",
+    }
+    assert stage.process(again) is None
+    assert (stage.passed, stage.duplicates) == (1, 1)
+
+
+def test_contact_stage_normalize_does_not_mark_seen():
+    stage = ContactStage(company=0, email=1, url=2)
+    row = ("(주)가나다", "", "www.ganada.kr")
+
+    assert stage.normalize(row) == ["가나다", "", "http://www.ganada.kr"]
+    assert stage.is_new(stage.normalize(row))
+    assert not stage.is_new(stage.normalize(("가나다", "", "https://ganada.kr/")))
+
+
+def test_seen_set_keeps_keys_across_runs(tmp_path):
+    path = str(tmp_path / "seen.bin")
+    seen = SeenSet(path)
+    assert seen.add(hashed_key("email", "a@x.com"))
+    seen.save()
+
+    again = SeenSet(path)
+    assert not again.add(hashed_key("email", "a@x.com"))
+    assert again.add(hashed_key("email", "b@x.com"))
+
+
+def test_bloom_filter_never_forgets_and_persists(tmp_path):
+    path = str(tmp_path / "seen.bloom")
+    bloom = BloomFilter(1000, path=path)
+    keys = [hashed_key("email", f"user{i}@x.com") for i in range(500)]
+    assert all(bloom.add(key) for key in keys)
+    bloom.save()
+
+    again = BloomFilter(10, path=path)  # Capacity of a saved filter is kept
+    assert not any(again.add(key) for key in keys)
+    fresh = [hashed_key("email", f"other{i}@x.com") for i in range(500)]
+    assert sum(again.add(key) for key in fresh) >= 495
+
+
+def test_bloom_filter_rejects_other_files(tmp_path):
+    path = tmp_path / "seen.bin"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        BloomFilter(10, path=str(path))
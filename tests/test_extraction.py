@@ -0,0 +1,69 @@
+from pathlib import Path
+
+from posting_parser import is_security_page, parse_listings, parse_posting
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+def read_fixture(name):
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+def test_parse_posting_reads_every_field():
+    posting = parse_posting(read_fixture("jobkorea_posting.html"))
+
+    assert posting["email"] == "HR@GanadaSoft.co.kr"
+    assert posting["position_name"] == "SI 백엔드 개발자 (3년 이상)"
+    assert posting["company_info"] == {
+        "industry": "소프트웨어 개발",
+        "employees": "120",
+        "established": "2009",
+        "company_size": "중소기업",
+        "homepage": "http://www.ganadasoft.co.kr/",
+    }
+
+
+def test_parse_posting_without_content():
+    posting = parse_posting("<html><body><p>공고가 마감되었습니다</p></body></html>")
+
+    assert posting["email_text"] is None
+    assert posting["email"] is None
+    assert posting["position_name"] == ""
+    assert set(posting["company_info"].values()) == {""}
+
+
+def test_parse_listings_skips_items_without_a_link():
+    listings = parse_listings(read_fixture("jobkorea_search.html"))
+
+    assert listings == [
+        ("(주)가나다소프트", "/Recruit/GI_Read/101"),
+        ("라마바", "/Recruit/GI_Read/102"),
+    ]
+
+
+def test_parse_listings_without_a_result_list():
+    assert parse_listings("<p>검색 결과가 없습니다</p>") is None
+
+
+def test_is_security_page():
+    blocked = '<p class="reasonExp">보안정책에 의해 접근이 차단되었습니다</p>'
+
+    assert is_security_page(blocked)
+    assert not is_security_page(read_fixture("jobkorea_posting.html"))
+
+
+def test_parse_member_fields_with_omitted_end_tags(tour):
+    fields = tour.parse_member_fields(read_fixture("kata_member.html"))
+
+    assert fields == {
+        "company": "주식회사 여행나라",
+        "representative": "홍길동",
+        "address": "서울특별시 중구 세종대로 1",
+        "tel": "02 123 4567",
+        "email": "Info@TravelNara.kr",
+        "website": "www.travelnara.kr/",
+    }
+
+
+def test_parse_member_fields_without_the_table(tour):
+    assert tour.parse_member_fields("<p>잘못된 접근입니다</p>") is None
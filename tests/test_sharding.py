@@ -0,0 +1,152 @@
+import csv
+
+from common.contacts import ContactStage, SeenSet, hashed_key
+from common.sharding import merge_csv_files, shard_of, shard_path
+
+RESULT_HEADER = [
+    "Company Name",
+    "Email",
+    "Position Name",
+    "Industry",
+    "Employees",
+    "Established Year",
+    "Company Size",
+    "Homepage",
+]
+
+
+def write_csv(path, header, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return str(path)
+
+
+def read_csv(path):
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def test_shard_helpers():
+    assert shard_path("results.csv", 2) == "results.shard2.csv"
+    assert shard_of("member-1", 4) == shard_of("member-1", 4)
+    assert {shard_of(f"member-{i}", 3) for i in range(100)} == {0, 1, 2}
+
+
+def test_merge_csv_files_dedupes_sorts_and_limits(tmp_path):
+    header = ["code", "email"]
+    paths = [
+        write_csv(tmp_path / "a.csv", header, [["3", "c@x.com"], ["1", "a@x.com"]]),
+        write_csv(tmp_path / "b.csv", header, [["2", "b@x.com"], ["1", "a@x.com"]]),
+        str(tmp_path / "missing.csv"),
+    ]
+    output = str(tmp_path / "merged.csv")
+
+    count = merge_csv_files(
+        paths, output, ["code"], sort_key=lambda row: int(row["code"]), limit=2
+    )
+
+    assert count == 2
+    assert read_csv(output) == [
+        {"code": "1", "email": "a@x.com"},
+        {"code": "2", "email": "b@x.com"},
+    ]
+
+
+def test_merge_csv_files_filters_only_rows_within_the_limit(tmp_path):
+    header = ["code", "email"]
+    paths = [
+        write_csv(
+            tmp_path / "a.csv",
+            header,
+            [["1", "A@x.com"], ["2", "a@x.com"], ["3", "b@x.com"], ["4", "c@x.com"]],
+        )
+    ]
+    stage = ContactStage(email="email")
+
+    count = merge_csv_files(
+        paths,
+        str(tmp_path / "merged.csv"),
+        ["code"],
+        sort_key=lambda row: int(row["code"]),
+        limit=2,
+        row_filter=stage.process,
+    )
+
+    assert count == 2
+    assert [row["email"] for row in read_csv(tmp_path / "merged.csv")] == [
+        "a@x.com",
+        "b@x.com",
+    ]
+    # c@x.com was cut by the limit, so it must not be remembered as seen
+    assert stage.seen.add(hashed_key("email", "c@x.com"))
+
+
+def test_merge_email_results_keeps_recruit_order(tmp_path, monkeypatch):
+    from cold_mail_collector import JobScraper
+
+    monkeypatch.chdir(tmp_path)
+    recruit = write_csv(
+        tmp_path / "urls.csv",
+        ["Company Name", "URL"],
+        [["(주)가나다", "u1"], ["라마바", "u2"], ["주식회사 사아자", "u3"]],
+    )
+    # Shard rows hold normalized names and may repeat a contact
+    paths = [
+        write_csv(
+            tmp_path / "s0.csv",
+            RESULT_HEADER,
+            [["사아자", "c@x.com", "", "", "", "", "", ""]],
+        ),
+        write_csv(
+            tmp_path / "s1.csv",
+            RESULT_HEADER,
+            [
+                ["라마바", "b@x.com", "", "", "", "", "", ""],
+                ["가나다", "a@x.com", "", "", "", "", "", ""],
+                ["라마바", "B@X.com", "", "", "", "", "", ""],
+            ],
+        ),
+    ]
+    scraper = JobScraper()
+    scraper.set_max_emails(2)
+
+    scraper.merge_email_results(recruit, paths, str(tmp_path / "merged.csv"))
+
+    assert [row["Email"] for row in read_csv(tmp_path / "merged.csv")] == [
+        "a@x.com",
+        "b@x.com",
+    ]
+
+
+def test_merge_email_results_skips_and_records_seen_contacts(tmp_path, monkeypatch):
+    from cold_mail_collector import JobScraper
+
+    monkeypatch.chdir(tmp_path)
+    seen_path = str(tmp_path / "seen.bin")
+    seen = SeenSet(seen_path)
+    seen.add(hashed_key("email", "a@x.com"))
+    seen.save()
+    recruit = write_csv(
+        tmp_path / "urls.csv",
+        ["Company Name", "URL"],
+        [["가나다", "u1"], ["라마바", "u2"]],
+    )
+    paths = [
+        write_csv(
+            tmp_path / "s0.csv",
+            RESULT_HEADER,
+            [
+                ["가나다", "a@x.com", "", "", "", "", "", ""],
+                ["라마바", "b@x.com", "", "", "", "", "", ""],
+            ],
+        )
+    ]
+    scraper = JobScraper()
+    scraper.set_seen_store(seen_path)
+
+    scraper.merge_email_results(recruit, paths, str(tmp_path / "merged.csv"))
+
+    assert [row["Email"] for row in read_csv(tmp_path / "merged.csv")] == ["b@x.com"]
+    assert not SeenSet(seen_path).add(hashed_key("email", "b@x.com"))
@@ -0,0 +1,73 @@
+from snapshot import MemberSnapshot, member_id
+
+
+def member(code):
+    return {"businesscode": str(code), "custcode": "1"}
+
+
+def test_plan_splits_new_sampled_and_removed(tmp_path):
+    snapshot = MemberSnapshot(str(tmp_path / "snapshot.json"))
+    for code in (1, 2, 3, 4):
+        snapshot.update(member(code), {"company": f"회사 {code}"})
+    snapshot.mark_failed(member(4))
+
+    new, sampled, removed = snapshot.plan([member(c) for c in (2, 3, 4, 5)], 1)
+
+    assert new == [member(5)]
+    assert sampled == [member(4), member(2)]  # Failed members come first
+    assert removed == [member_id(member(1))]
+    _, sampled, _ = snapshot.plan([member(c) for c in (2, 3, 4, 5)], 1)
+    assert sampled[1:] == [member(3)]  # The sample rotates between runs
+
+
+def test_update_reports_only_real_changes(tmp_path):
+    path = str(tmp_path / "snapshot.json")
+    snapshot = MemberSnapshot(path)
+    snapshot.update(member(1), {"company": "여행", "tel": "02-123-4567"})
+    snapshot.save()
+
+    again = MemberSnapshot(path)
+    again.update(member(1), {"tel": "02-123-4567", "company": "여행"})
+    again.update(member(2), {"company": "새 회사"})
+
+    assert again.diff() == {
+        "added": [{"company": "새 회사"}],
+        "changed": [],
+        "removed": [],
+    }
+
+
+class ListWriter:
+    def __init__(self):
+        self.rows = []
+
+    def write(self, row):
+        self.rows.append(row)
+
+
+def test_save_member_gives_the_snapshot_normalized_duplicates(tour, monkeypatch):
+    monkeypatch.setattr(
+        tour, "contact_stage", tour.ContactStage(**tour.contact_stage.columns)
+    )
+    detail = {
+        "company": "주식회사 여행",
+        "representative": "홍길동",
+        "address": "서울",
+        "tel": "02 123 4567",
+        "email": "Info@Travel.kr",
+        "website": "travel.kr",
+    }
+    writer = ListWriter()
+    seen = []
+
+    def on_detail(member, record):
+        seen.append(record)
+
+    tour.save_member(writer, member(1), detail, on_detail)
+    tour.save_member(writer, member(2), dict(detail), on_detail)  # Duplicate
+    tour.save_member(writer, member(3), {**detail, "website": ""}, on_detail)
+
+    assert len(writer.rows) == 1
+    assert seen[0] == seen[1] == writer.rows[0]
+    assert seen[1]["company"] == "여행" and seen[1]["tel"] == "02-123-4567"
+    assert seen[2]["company"] == "여행"